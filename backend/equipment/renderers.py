@@ -0,0 +1,64 @@
+"""
+orjson-backed JSON renderer and parser for the REST API.
+
+Both classes fall back to DRF's stdlib-json implementations when orjson is
+not installed, so the API keeps working on platforms without a wheel. They
+are the REST_FRAMEWORK defaults in settings.py.
+"""
+import math
+
+from rest_framework import renderers, parsers
+from rest_framework.exceptions import ParseError
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+
+def _contains_non_finite(data):
+    """Return True if a NaN or infinite float appears anywhere in data"""
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, dict):
+        return any(_contains_non_finite(value) for value in data.values())
+    if isinstance(data, (list, tuple)):
+        return any(_contains_non_finite(item) for item in data)
+    return False
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    """JSONRenderer that serializes with orjson when it is available"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        renderer_context = renderer_context or {}
+        # Indented output is only requested by humans; leave it to stdlib json
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if data is None:
+            return b''
+
+        # orjson writes NaN/Infinity as null; STRICT_JSON makes stdlib json refuse them instead
+        if self.strict and _contains_non_finite(data):
+            raise ValueError("Out of range float values are not JSON compliant")
+
+        # DRF's encoder covers lazy strings, Decimals, querysets and the like;
+        # non-str dict keys are stringified like json.dumps does
+        ret = orjson.dumps(data, default=JSONEncoder().default, option=orjson.OPT_NON_STR_KEYS)
+        # Match JSONRenderer, which escapes these for safe embedding in JavaScript
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class ORJSONParser(parsers.JSONParser):
+    """JSONParser that decodes request bodies with orjson when it is available"""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -33,6 +33,31 @@ class DatasetSerializer(serializers.ModelSerializer):
             'avg_temperature',
             'type_distribution'
         ]
+    
+    def validate_total_count(self, value):
+        """
+        Validate the record count is not negative.
+        """
+        if value < 0:
+            raise serializers.ValidationError("Total count must be a non-negative integer.")
+        return value
+    
+    def validate_type_distribution(self, value):
+        """
+        Validate type distribution maps equipment type names to non-negative counts.
+        """
+        if not isinstance(value, dict):
+            raise serializers.ValidationError("Type distribution must be an object.")
+        
+        for equipment_type, count in value.items():
+            if not isinstance(equipment_type, str):
+                raise serializers.ValidationError("Equipment types must be strings.")
+            if isinstance(count, bool) or not isinstance(count, int) or count < 0:
+                raise serializers.ValidationError(
+                    f"Count for '{equipment_type}' must be a non-negative integer."
+                )
+        
+        return value
 
 
 class DatasetDetailSerializer(DatasetSerializer):
@@ -5,8 +5,20 @@ import os
 import google.generativeai as genai
 from django.core.files.uploadedfile import UploadedFile
 import json
+from collections import Counter
 from typing import Dict, List, Union, Optional
 
+from .models import Equipment
+from .utils import REQUIRED_COLUMNS, NUMERIC_COLUMNS
+
+try:
+    # Optional: pandas can hand whole-file parsing to Arrow's multithreaded reader
+    import pyarrow
+    HAS_PYARROW = True
+except ImportError:
+    pyarrow = None
+    HAS_PYARROW = False
+
 # Lazy load Gemini to avoid key check on import
 try:
     genai.configure(api_key=os.getenv('GOOGLE_GEMINI_API_KEY'))
@@ -64,6 +76,44 @@ def normalize_column_name(column_name: str) -> str:
     return column_mapping.get(normalized, normalized)
 
 
+PREVIEW_ROW_LIMIT = 100
+
+# Uploads above this size are parsed in chunks so peak memory stays bounded
+CHUNKED_PARSE_THRESHOLD = 5 * 1024 * 1024
+CSV_CHUNK_SIZE = 200_000
+
+# Rows read, converted and bulk-inserted per step when storing equipment records
+EQUIPMENT_BATCH_SIZE = 1000
+
+
+def _read_csv_whole(uploaded_file: UploadedFile) -> pd.DataFrame:
+    """
+    Read a whole CSV into one DataFrame, using the optional pyarrow engine when installed.
+    Input Arrow fails to parse is re-read with the C parser so its errors are reported.
+    """
+    if HAS_PYARROW:
+        try:
+            return pd.read_csv(uploaded_file, engine='pyarrow')
+        except (pyarrow.ArrowException, ValueError):
+            # pandas surfaces Arrow parse failures as ArrowInvalid or ParserError (a ValueError)
+            uploaded_file.seek(0)
+    return pd.read_csv(uploaded_file)
+
+
+def _iter_csv_chunks(uploaded_file: UploadedFile):
+    """
+    Yield the uploaded CSV as DataFrames. Small files are read in one go,
+    larger ones are streamed in CSV_CHUNK_SIZE-row chunks.
+    """
+    size = getattr(uploaded_file, 'size', None)
+    if size is not None and size <= CHUNKED_PARSE_THRESHOLD:
+        yield _read_csv_whole(uploaded_file)
+        return
+    
+    with pd.read_csv(uploaded_file, chunksize=CSV_CHUNK_SIZE) as reader:
+        yield from reader
+
+
 def analyze_equipment_csv_from_uploaded_file(uploaded_file: UploadedFile) -> Dict[str, Union[int, float, Dict[str, int], List[Dict[str, Union[str, float]]]]]:
     """
     Parses an uploaded CSV file, validates it, and calculates summary statistics.
@@ -73,77 +123,75 @@ def analyze_equipment_csv_from_uploaded_file(uploaded_file: UploadedFile) -> Dic
         # Reset file pointer to ensure we read from the beginning
         uploaded_file.seek(0)
         
-        # Read CSV
-        df = pd.read_csv(uploaded_file)
+        # Running totals, folded chunk by chunk
+        total_rows = 0
+        total_count = 0
+        sums = dict.fromkeys(NUMERIC_COLUMNS, 0.0)
+        counts = dict.fromkeys(NUMERIC_COLUMNS, 0)
+        type_counter = Counter()
+        preview_rows = []
+        columns = None
+        
+        for df in _iter_csv_chunks(uploaded_file):
+            # Normalize column names (once, the header is shared by every chunk)
+            if columns is None:
+                columns = [normalize_column_name(str(col).strip().lower()) for col in df.columns]
+                missing_columns = [col for col in REQUIRED_COLUMNS if col not in columns]
+                
+                if missing_columns:
+                    # Map back to readable names for the error message
+                    readable_names = {
+                        'equipment_name': 'Equipment Name',
+                        'type': 'Type',
+                        'flowrate': 'Flowrate',
+                        'pressure': 'Pressure',
+                        'temperature': 'Temperature'
+                    }
+                    missing_readable = [readable_names.get(col, col) for col in missing_columns]
+                    raise CSVParsingError(f"Missing required columns: {', '.join(missing_readable)}")
+            df.columns = columns
+            total_rows += len(df)
+            
+            # Drop rows that are completely empty in the required columns
+            df_clean = df.dropna(subset=REQUIRED_COLUMNS, how='all')
+            if df_clean.empty:
+                continue
+            
+            # Convert numeric columns to numeric types, coercing errors to NaN
+            for col in NUMERIC_COLUMNS:
+                df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce')
+                sums[col] += df_clean[col].sum()
+                counts[col] += int(df_clean[col].count())
+            
+            total_count += len(df_clean)
+            
+            # Ensure 'type' is string and handle missing values
+            df_clean['type'] = df_clean['type'].fillna('Unknown').astype(str).str.strip()
+            type_counter.update(df_clean['type'].value_counts().to_dict())
+            
+            # Keep the first PREVIEW_ROW_LIMIT rows for the preview
+            if len(preview_rows) < PREVIEW_ROW_LIMIT:
+                preview_df = df_clean.head(PREVIEW_ROW_LIMIT - len(preview_rows))
+                # Replace NaN with None for JSON serialization
+                preview_df = preview_df.astype(object).where(pd.notnull(preview_df), None)
+                preview_rows.extend(preview_df.to_dict(orient='records'))
         
-        if df.empty:
+        if total_rows == 0:
             raise CSVParsingError("The uploaded CSV file is empty.")
         
-        # Normalize column names
-        df.columns = df.columns.str.strip().str.lower()
-        df.columns = [normalize_column_name(str(col)) for col in df.columns]
-        
-        # Define and check for required columns
-        required_columns = ['equipment_name', 'type', 'flowrate', 'pressure', 'temperature']
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        
-        if missing_columns:
-            # Map back to readable names for the error message
-            readable_names = {
-                'equipment_name': 'Equipment Name',
-                'type': 'Type',
-                'flowrate': 'Flowrate',
-                'pressure': 'Pressure',
-                'temperature': 'Temperature'
-            }
-            missing_readable = [readable_names.get(col, col) for col in missing_columns]
-            raise CSVParsingError(f"Missing required columns: {', '.join(missing_readable)}")
-        
-        # Drop rows where ALL required columns are missing (keep rows with partial data if useful, 
-        # but for this strict analysis, we might want to be careful. 
-        # The original logic dropped if ALL were missing. Let's stick to that but maybe stricter?)
-        # Actually, let's drop rows that are completely empty in the required columns.
-        df_clean = df.dropna(subset=required_columns, how='all')
-        
-        if df_clean.empty:
+        if total_count == 0:
             raise CSVParsingError("No valid data found after cleaning empty rows.")
         
-        # Convert numeric columns to numeric types, coercing errors to NaN
-        numeric_columns = ['flowrate', 'pressure', 'temperature']
-        for col in numeric_columns:
-            df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce')
-        
-        # Calculate statistics
-        # We only count rows that have at least some data
-        total_count = len(df_clean)
-        
-        # Calculate averages (ignoring NaNs)
-        avg_flowrate = df_clean['flowrate'].mean()
-        avg_pressure = df_clean['pressure'].mean()
-        avg_temperature = df_clean['temperature'].mean()
-        
-        # Type distribution
-        # Ensure 'type' is string and handle missing values
-        df_clean['type'] = df_clean['type'].fillna('Unknown').astype(str).str.strip()
-        type_counts = df_clean['type'].value_counts()
-        type_distribution = type_counts.to_dict()
-        
-        # Prepare preview rows (limit to first 100)
-        preview_df = df_clean.head(100).copy()
-        # Replace NaN with None for JSON serialization
-        preview_df = preview_df.where(pd.notnull(preview_df), None)
-        preview_rows = preview_df.to_dict(orient='records')
-        
-        # Helper to safely round values
-        def safe_round(val):
-            return round(val, 2) if pd.notnull(val) else None
+        # Averages ignore missing values; a column with no values averages to None
+        def safe_mean(col):
+            return round(float(sums[col] / counts[col]), 2) if counts[col] else None
 
         return {
             'total_count': int(total_count),
-            'avg_flowrate': safe_round(avg_flowrate),
-            'avg_pressure': safe_round(avg_pressure),
-            'avg_temperature': safe_round(avg_temperature),
-            'type_distribution': type_distribution,
+            'avg_flowrate': safe_mean('flowrate'),
+            'avg_pressure': safe_mean('pressure'),
+            'avg_temperature': safe_mean('temperature'),
+            'type_distribution': dict(type_counter.most_common()),
             'preview_rows': preview_rows
         }
         
@@ -157,6 +205,29 @@ def analyze_equipment_csv_from_uploaded_file(uploaded_file: UploadedFile) -> Dic
         raise CSVParsingError(f"Unexpected error during CSV analysis: {str(e)}")
 
 
+def build_equipment_records(dataset, df: pd.DataFrame) -> List[Equipment]:
+    """
+    Build unsaved Equipment objects for one chunk of an uploaded CSV.
+    Rows without both a name and a type are skipped; missing readings become 0.0.
+    """
+    df = df.copy()
+    df.columns = [normalize_column_name(str(col)) for col in df.columns]
+    df = df.reindex(columns=REQUIRED_COLUMNS)
+    
+    # Skip empty rows
+    df = df[df['equipment_name'].notna() | df['type'].notna()]
+    
+    names = df['equipment_name'].map(lambda v: '' if pd.isna(v) else str(v).strip())
+    types = df['type'].map(lambda v: '' if pd.isna(v) else str(v).strip())
+    readings = [pd.to_numeric(df[col]).fillna(0.0).astype(float) for col in NUMERIC_COLUMNS]
+    
+    return [
+        Equipment(dataset=dataset, name=name, type=eq_type,
+                  flowrate=flowrate, pressure=pressure, temperature=temperature)
+        for name, eq_type, flowrate, pressure, temperature in zip(names, types, *readings)
+    ]
+
+
 def generate_ai_insights(dataset_summary: Dict) -> str:
     """
     Generates AI insights using Google's Gemini model based on the provided dataset summary.
@@ -1,9 +1,22 @@
 import csv
 import io
+import numpy as np
+import pandas as pd
+from collections import Counter
+from itertools import islice
 from typing import List, Dict, Any
 from django.core.exceptions import ValidationError
 
 
+REQUIRED_COLUMNS = ['equipment_name', 'type', 'flowrate', 'pressure', 'temperature']
+NUMERIC_COLUMNS = ['flowrate', 'pressure', 'temperature']
+
+# Header names as they appear in uploaded files, compared case-insensitively
+REQUIRED_HEADER_ORDER = tuple(col.replace('_', ' ') for col in REQUIRED_COLUMNS)
+REQUIRED_HEADERS = frozenset(REQUIRED_HEADER_ORDER)
+NUMERIC_HEADERS = tuple(col.replace('_', ' ') for col in NUMERIC_COLUMNS)
+
+
 class CSVProcessingError(ValueError):
     """Custom exception for CSV processing errors"""
     pass
@@ -22,7 +35,7 @@ def process_csv_content(csv_content: str) -> List[Dict[str, Any]]:
         csv_content: String containing CSV data
         
     Returns:
-        List of dictionaries with column headers as keys
+        List of dictionaries with normalized column names as keys
         
     Raises:
         ValueError: If CSV format is invalid
@@ -31,59 +44,40 @@ def process_csv_content(csv_content: str) -> List[Dict[str, Any]]:
         raise CSVValidationError("CSV content is empty")
     
     try:
-        # Use StringIO to treat string as file-like object
-        csv_file = io.StringIO(csv_content)
-        reader = csv.DictReader(csv_file)
-        
-        # Check required columns (case-insensitive)
-        required_columns = ['Equipment Name', 'Type', 'Flowrate', 'Pressure', 'Temperature']
-        actual_columns = [col.strip() for col in reader.fieldnames] if reader.fieldnames else []
-        
-        # Normalize column names for comparison (case-insensitive, strip whitespace)
-        normalized_actual = [col.lower().strip() for col in actual_columns]
-        normalized_required = [col.lower().strip() for col in required_columns]
-        
-        missing_columns = []
-        for req_col in normalized_required:
-            if req_col not in normalized_actual:
-                missing_columns.append(req_col)
-        
-        if missing_columns:
-            raise CSVProcessingError(f"Invalid CSV format: Missing required columns: {', '.join(missing_columns)}")
-        
-        # Reset file pointer to read data rows
-        csv_file.seek(0)
-        reader = csv.DictReader(csv_file)
-        
-        rows = []
-        for row_num, row in enumerate(reader, start=1):  # Start at 1 for header row
-            if row_num == 1:  # Skip header row
-                continue
-                
-            # Convert numeric fields and normalize column names
-            processed_row = {}
-            for key, value in row.items():
-                # Normalize column names to lowercase with underscores
-                normalized_key = key.strip().lower().replace(' ', '_')
-                
-                if value is not None and str(value).strip():  # Only process non-empty values
-                    # Convert numeric fields
-                    if normalized_key in ['flowrate', 'pressure', 'temperature']:
-                        try:
-                            processed_row[normalized_key] = float(str(value).strip())
-                        except ValueError:
-                            raise CSVProcessingError(f"Invalid data type in row {row_num}")
-                    else:
-                        processed_row[normalized_key] = str(value).strip()
-                else:
-                    processed_row[normalized_key] = None
-            
-            rows.append(processed_row)
-        
-        return rows
-        
-    except csv.Error as e:
+        # Read every cell as text so values round-trip exactly; numeric columns are converted below
+        df = pd.read_csv(io.StringIO(csv_content), dtype=str, keep_default_na=False, skipinitialspace=True)
+    except (pd.errors.ParserError, pd.errors.EmptyDataError) as e:
         raise CSVProcessingError(f"Invalid CSV format: {str(e)}")
+    
+    # Normalize column names to lowercase with underscores
+    df.columns = [str(col).strip().lower().replace(' ', '_') for col in df.columns]
+    
+    missing_columns = [
+        col.replace('_', ' ') for col in REQUIRED_COLUMNS if col not in df.columns
+    ]
+    if missing_columns:
+        raise CSVProcessingError(f"Invalid CSV format: Missing required columns: {', '.join(missing_columns)}")
+    
+    # Strip values and treat blank or absent cells as missing
+    df = df.apply(lambda col: col.str.strip())
+    blank = (df == '') | df.isna()
+    
+    for col in NUMERIC_COLUMNS:
+        numeric = pd.to_numeric(df[col].where(~blank[col]), errors='coerce')
+        invalid = numeric.isna() & ~blank[col]
+        if invalid.any():
+            row_num = int(invalid.to_numpy().argmax()) + 1
+            raise CSVProcessingError(f"Invalid data type in row {row_num}")
+        df[col] = numeric.astype(object)
+    
+    df = df.mask(blank, None)
+    return df.to_dict(orient='records')
+
+
+def _column_mean(values: np.ndarray) -> float:
+    """Mean of the non-missing values, or 0.0 when there are none"""
+    present = values[~np.isnan(values)]
+    return float(present.mean()) if present.size else 0.0
 
 
 def calculate_statistics(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -96,7 +90,8 @@ def calculate_statistics(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
     Returns:
         Dictionary containing calculated statistics
     """
-    if not rows:
+    total_count = len(rows)
+    if not total_count:
         return {
             'total_count': 0,
             'avg_flowrate': 0.0,
@@ -105,29 +100,23 @@ def calculate_statistics(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
             'type_distribution': {}
         }
     
-    total_count = len(rows)
-    
-    # Calculate averages for numeric fields
-    flowrates = [row['flowrate'] for row in rows if row.get('flowrate') is not None]
-    pressures = [row['pressure'] for row in rows if row.get('pressure') is not None]
-    temperatures = [row['temperature'] for row in rows if row.get('temperature') is not None]
-    
-    avg_flowrate = sum(flowrates) / len(flowrates) if flowrates else 0.0
-    avg_pressure = sum(pressures) / len(pressures) if pressures else 0.0
-    avg_temperature = sum(temperatures) / len(temperatures) if temperatures else 0.0
-    
-    # Calculate type distribution
-    type_distribution = {}
-    for row in rows:
-        equipment_type = row.get('type', 'Unknown')
-        type_distribution[equipment_type] = type_distribution.get(equipment_type, 0) + 1
+    # Missing values become NaN so they drop out of the averages
+    averages = {
+        col: _column_mean(np.fromiter(
+            (np.nan if row.get(col) is None else row[col] for row in rows),
+            dtype=np.float64,
+            count=total_count
+        ))
+        for col in NUMERIC_COLUMNS
+    }
+    type_distribution = Counter(row.get('type', 'Unknown') for row in rows)
     
     return {
         'total_count': total_count,
-        'avg_flowrate': round(avg_flowrate, 6),
-        'avg_pressure': round(avg_pressure, 6),
-        'avg_temperature': round(avg_temperature, 6),
-        'type_distribution': type_distribution
+        'avg_flowrate': round(averages['flowrate'], 6),
+        'avg_pressure': round(averages['pressure'], 6),
+        'avg_temperature': round(averages['temperature'], 6),
+        'type_distribution': dict(type_distribution)
     }
 
 
@@ -141,46 +130,35 @@ def validate_csv_format(csv_content: str) -> None:
     Raises:
         ValueError: If CSV format is invalid or required columns are missing
     """
-    if not csv_content.strip():
+    if not csv_content or csv_content.isspace():
         raise CSVValidationError("CSV content is empty")
     
     try:
-        csv_file = io.StringIO(csv_content)
-        reader = csv.DictReader(csv_file)
-        
-        # Check required columns (case-insensitive)
-        required_columns = ['Equipment Name', 'Type', 'Flowrate', 'Pressure', 'Temperature']
-        actual_columns = [col.strip() for col in reader.fieldnames] if reader.fieldnames else []
-        
-        # Normalize column names for comparison (case-insensitive, strip whitespace)
-        normalized_actual = [col.lower().strip() for col in actual_columns]
-        normalized_required = [col.lower().strip() for col in required_columns]
+        # The reader is lazy: only the header and the first few rows are parsed
+        reader = csv.reader(io.StringIO(csv_content))
         
-        missing_columns = []
-        for req_col in normalized_required:
-            if req_col not in normalized_actual:
-                missing_columns.append(req_col)
-        
-        if missing_columns:
+        # Check required columns (case-insensitive, whitespace-tolerant, any order)
+        header = [col.strip().lower() for col in next(reader, [])]
+        if not REQUIRED_HEADERS <= set(header):
+            missing_columns = [col for col in REQUIRED_HEADER_ORDER if col not in header]
             raise CSVValidationError(f"Missing required columns: {', '.join(missing_columns)}")
         
-        # Validate at least one data row
-        data_rows = list(reader)
-        if not data_rows:
-            raise CSVValidationError("CSV must contain at least one data row")
+        # Validate at least one data row, checking data types in the first 5
+        numeric_fields = [(header.index(col), col.title()) for col in NUMERIC_HEADERS]
+        data_rows = islice((row for row in reader if row), 5)
         
-        # Validate data types in first few rows
-        for i, row in enumerate(data_rows[:5]):  # Check first 5 rows
-            row_num = i + 2  # Account for header row
-            
-            # Check numeric fields
-            for field in ['Flowrate', 'Pressure', 'Temperature']:
-                value = row.get(field, '').strip()
+        row_num = 1
+        for row_num, row in enumerate(data_rows, start=2):  # Account for header row
+            for index, field in numeric_fields:
+                value = row[index].strip() if index < len(row) else ''
                 if value:  # Only validate if not empty
                     try:
                         float(value)
                     except ValueError:
                         raise CSVValidationError(f"Invalid numeric value for {field} in row {row_num}")
         
+        if row_num == 1:
+            raise CSVValidationError("CSV must contain at least one data row")
+        
     except csv.Error as e:
         raise CSVProcessingError(f"CSV format error: {str(e)}")
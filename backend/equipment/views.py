@@ -21,7 +21,10 @@ from .serializers import (
     LoginSerializer,
     UserSerializer
 )
-from .services import analyze_equipment_csv_from_uploaded_file, CSVParsingError, generate_ai_insights, AIGenerationError
+from .services import (
+    analyze_equipment_csv_from_uploaded_file, build_equipment_records, CSVParsingError,
+    generate_ai_insights, AIGenerationError, EQUIPMENT_BATCH_SIZE,
+)
 from .pdf_utils import generate_pdf_response
 from rest_framework.response import Response
 from rest_framework.decorators import api_view
@@ -174,44 +177,25 @@ class UploadDatasetView(APIView):
                 preview_rows=analysis_result['preview_rows']
             )
             
-            # Create equipment records
-            from .services import normalize_column_name
+            # Create equipment records, one EQUIPMENT_BATCH_SIZE chunk at a time so
+            # the whole file is never materialised in memory
             try:
                 # Try reading saved file
                 if dataset.csv_file and hasattr(dataset.csv_file, 'path'):
-                    df = pd.read_csv(dataset.csv_file.path)
+                    reader = pd.read_csv(dataset.csv_file.path, chunksize=EQUIPMENT_BATCH_SIZE)
                 else:
                     # Fallback to uploaded file
                     file_obj.seek(0)
-                    df = pd.read_csv(file_obj)
+                    reader = pd.read_csv(file_obj, chunksize=EQUIPMENT_BATCH_SIZE)
             except (ValueError, AttributeError, OSError, FileNotFoundError):
-                df = None
+                reader = None
             
-            if df is not None:
-                df.columns = [normalize_column_name(str(col)) for col in df.columns]
-                
-                # Create equipment objects
-                eq_objects = []
-                for _, row in df.iterrows():
-                    # Skip empty rows
-                    if pd.isna(row.get('equipment_name')) and pd.isna(row.get('type')):
-                        continue
-                        
-                    eq_objects.append(Equipment(
-                        dataset=dataset,
-                        name=str(row.get('equipment_name', '')).strip() if not pd.isna(row.get('equipment_name')) else '',
-                        type=str(row.get('type', '')).strip() if not pd.isna(row.get('type')) else '',
-                        flowrate=float(row.get('flowrate', 0)) if not pd.isna(row.get('flowrate')) else 0.0,
-                        pressure=float(row.get('pressure', 0)) if not pd.isna(row.get('pressure')) else 0.0,
-                        temperature=float(row.get('temperature', 0)) if not pd.isna(row.get('temperature')) else 0.0
-                    ))
-                
-                # Bulk create in batches
-                if eq_objects:
-                    batch_size = 1000
-                    for i in range(0, len(eq_objects), batch_size):
-                        batch = eq_objects[i:i + batch_size]
-                        Equipment.objects.bulk_create(batch, ignore_conflicts=True)
+            if reader is not None:
+                with reader:
+                    for chunk in reader:
+                        eq_objects = build_equipment_records(dataset, chunk)
+                        if eq_objects:
+                            Equipment.objects.bulk_create(eq_objects, ignore_conflicts=True)
             
             # Return dataset info
             detail_serializer = DatasetDetailSerializer(dataset, context={'request': request})
@@ -1,10 +1,18 @@
 import pytest
-import tempfile
 import csv
 from io import StringIO
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
 from rest_framework.test import APIClient
 from equipment.models import Dataset
+from equipment.services import analyze_equipment_csv_from_uploaded_file
+
+
+def pytest_configure(config):
+    """Hash test passwords with MD5; the default PBKDF2 rounds only slow the suite down"""
+    settings.PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
 
 
 @pytest.fixture
@@ -13,14 +21,21 @@ def api_client():
     return APIClient()
 
 
+@pytest.fixture(scope='session')
+def session_user(django_db_setup, django_db_blocker):
+    """Create the test user once per session, outside the per-test transactions"""
+    with django_db_blocker.unblock():
+        return User.objects.filter(username='testuser').first() or User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+
+
 @pytest.fixture
-def user(db):
-    """Create a test user"""
-    return User.objects.create_user(
-        username='testuser',
-        email='test@example.com',
-        password='testpass123'
-    )
+def user(db, session_user):
+    """Return the shared test user with database access enabled"""
+    return session_user
 
 
 @pytest.fixture
@@ -30,7 +45,7 @@ def auth_client(api_client, user):
     return api_client
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def sample_csv_content():
     """Return sample CSV content as string"""
     csv_content = StringIO()
@@ -53,39 +68,50 @@ def sample_csv_content():
     return csv_content.getvalue()
 
 
+@pytest.fixture(scope='session')
+def sample_csv_bytes(sample_csv_content):
+    """Return sample CSV content encoded once per session"""
+    return sample_csv_content.encode()
+
+
+@pytest.fixture(scope='session')
+def sample_preview_rows(sample_csv_bytes):
+    """Return the preview rows the upload pipeline stores for the sample CSV, parsed once"""
+    upload = SimpleUploadedFile('sample.csv', sample_csv_bytes, content_type='text/csv')
+    return analyze_equipment_csv_from_uploaded_file(upload)['preview_rows']
+
+
 @pytest.fixture
-def sample_csv_file(sample_csv_content):
-    """Return a temporary CSV file with sample data"""
-    with tempfile.NamedTemporaryFile(mode='w+', suffix='.csv', delete=False) as f:
-        f.write(sample_csv_content)
-        f.seek(0)
-        return f
+def sample_csv_upload(sample_csv_bytes):
+    """Return a fresh uploaded-file object over the cached sample CSV bytes"""
+    return SimpleUploadedFile('test.csv', sample_csv_bytes, content_type='text/csv')
 
 
 @pytest.fixture
-def equipment_dataset(user, sample_csv_content):
+def equipment_dataset(user, sample_csv_bytes, sample_preview_rows):
     """Create a test EquipmentDataset"""
     return Dataset.objects.create(
         name='Test Dataset',
         uploaded_by=user,
-        csv_file=tempfile.NamedTemporaryFile(suffix='.csv', delete=False),
+        csv_file=ContentFile(sample_csv_bytes, name='test_dataset.csv'),
         total_count=5,
         avg_flowrate=154.5,
         avg_pressure=2.6,
         avg_temperature=87.12,
-        type_distribution={'Pump': 2, 'Valve': 1, 'Reactor': 1, 'Column': 1}
+        type_distribution={'Pump': 2, 'Valve': 1, 'Reactor': 1, 'Column': 1},
+        preview_rows=sample_preview_rows
     )
 
 
 @pytest.fixture
-def multiple_datasets(user, sample_csv_content):
+def multiple_datasets(user, sample_csv_bytes):
     """Create multiple test datasets"""
     datasets = []
     for i in range(3):
         dataset = Dataset.objects.create(
             name=f'Test Dataset {i+1}',
             uploaded_by=user,
-            csv_file=tempfile.NamedTemporaryFile(suffix='.csv', delete=False),
+            csv_file=ContentFile(sample_csv_bytes, name=f'test_dataset_{i+1}.csv'),
             total_count=5,
             avg_flowrate=154.5 + i,
             avg_pressure=2.6 + i * 0.1,
@@ -0,0 +1,56 @@
+import pytest
+from equipment import services
+from equipment.services import generate_ai_insights
+
+
+class FakeResponse:
+    """Minimal stand-in for a Gemini generate_content response"""
+
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeGenerativeModel:
+    """Deterministic replacement for genai.GenerativeModel"""
+
+    prompts = []
+
+    def __init__(self, model_name):
+        self.model_name = model_name
+
+    def generate_content(self, prompt):
+        FakeGenerativeModel.prompts.append(prompt)
+        return FakeResponse("  - Pump count is high\n- Check valve pressure  ")
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """Route Gemini calls to the fake model instead of the network"""
+    FakeGenerativeModel.prompts = []
+    monkeypatch.setenv('GOOGLE_GEMINI_API_KEY', 'test-key')
+    monkeypatch.setattr(services.genai, 'configure', lambda **kwargs: None)
+    monkeypatch.setattr(services.genai, 'GenerativeModel', FakeGenerativeModel)
+    return FakeGenerativeModel
+
+
+class TestAIInsights:
+    """Test AI insight generation"""
+
+    def test_generate_ai_insights(self, db, fake_llm):
+        """Test insights are generated from the dataset summary"""
+        summary = {
+            'total_count': 10,
+            'avg_flowrate': 50.5,
+            'avg_pressure': 2.3,
+            'avg_temperature': 100.0,
+            'type_distribution': {'Pump': 5, 'Valve': 5}
+        }
+
+        insights = generate_ai_insights(summary)
+
+        assert insights == "- Pump count is high\n- Check valve pressure"
+        assert len(fake_llm.prompts) == 1
+        prompt = fake_llm.prompts[0]
+        assert 'Total Equipment Count: 10' in prompt
+        assert 'Average Flowrate: 50.5 L/min' in prompt
+        assert 'Top Equipment Types: Pump: 5, Valve: 5' in prompt
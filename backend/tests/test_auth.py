@@ -73,10 +73,15 @@ class TestAuthenticationAPI:
         assert response.status_code == 200
         assert 'results' in response.data
     
-    def test_unauthenticated_access(self, api_client):
-        """Test access without authentication"""
-        # Try to access protected endpoint without token
-        response = api_client.get('/api/datasets/')
+    @pytest.mark.parametrize('method, url', [
+        ('get', '/api/datasets/'),
+        ('get', '/api/datasets/1/'),
+        ('get', '/api/datasets/1/report/pdf/'),
+        ('post', '/api/upload/'),
+    ])
+    def test_requires_auth(self, api_client, method, url):
+        """Test protected endpoints reject requests without a token"""
+        response = getattr(api_client, method)(url)
         
         assert response.status_code == 401
     
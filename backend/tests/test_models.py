@@ -1,292 +1,180 @@
 import pytest
-import tempfile
-import os
-from django.core.files import File
+from datetime import timedelta
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
 from equipment.models import Dataset
 
 
-class TestDatasetModel:
+_DEFAULTS = dict(
+    total_count=1,
+    avg_flowrate=100.0,
+    avg_pressure=2.0,
+    avg_temperature=80.0,
+    type_distribution={'Pump': 1},
+)
+
+# Type counts of the conftest sample CSV; never mutated by the tests
+_SAMPLE_DISTRIBUTION = {'Pump': 2, 'Valve': 1, 'Reactor': 1, 'Column': 1}
+
+
+def _build(user, name, content=None, **kw):
+    """
+    Build an unsaved dataset for user, filling unspecified fields from _DEFAULTS.
+    Without content, csv_file is only a stored name and nothing is written to storage.
+    """
+    if content is None:
+        csv_file = f'uploads/{name}.csv'
+    else:
+        csv_file = ContentFile(content, name=f'{name}.csv')
+    return Dataset(name=name, uploaded_by=user, csv_file=csv_file, **{**_DEFAULTS, **kw})
+
+
+def _mk(user, name, content=None, **kw):
+    """Create and save a dataset for user"""
+    dataset = _build(user, name, content, **kw)
+    dataset.save(force_insert=True)
+    return dataset
+
+
+@override_settings(
+    STORAGES={**settings.STORAGES, 'default': {'BACKEND': 'django.core.files.storage.InMemoryStorage'}},
+)
+class TestDatasetModel(TestCase):
     """Test Dataset model"""
     
-    def test_create_dataset(self, user, sample_csv_content):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='modeluser',
+            email='model@example.com',
+            password='testpass123'
+        )
+    
+    @pytest.fixture(autouse=True)
+    def _inject_sample_csv(self, sample_csv_bytes):
+        self.sample_csv_bytes = sample_csv_bytes
+    
+    def test_create_dataset(self):
         """Test creating a dataset"""
-        # Create a proper temporary file for csv_file field
-        temp_file = tempfile.NamedTemporaryFile(mode='w+', suffix='.csv', delete=True)
-        temp_file.write(sample_csv_content)
-        temp_file.seek(0)  # Reset file pointer
-        
-        # Create Django File object with a proper name
-        django_file = File(temp_file, name='test_dataset.csv')
-        
-        dataset = Dataset.objects.create(
-            name='Test Dataset',
-            uploaded_by=user,
-            csv_file=django_file,
-            total_count=5,
-            avg_flowrate=154.5,
-            avg_pressure=2.6,
-            avg_temperature=87.12,
-            type_distribution={'Pump': 2, 'Valve': 1, 'Reactor': 1, 'Column': 1}
+        dataset = _mk(
+            self.user, 'Test Dataset', self.sample_csv_bytes,
+            total_count=5, avg_flowrate=154.5, avg_pressure=2.6, avg_temperature=87.12,
+            type_distribution=_SAMPLE_DISTRIBUTION
         )
         
         assert dataset.name == 'Test Dataset'
-        assert dataset.uploaded_by == user
+        assert dataset.uploaded_by == self.user
         assert dataset.total_count == 5
         assert dataset.avg_flowrate == 154.5
         assert dataset.avg_pressure == 2.6
         assert dataset.avg_temperature == 87.12
-        assert dataset.type_distribution == {'Pump': 2, 'Valve': 1, 'Reactor': 1, 'Column': 1}
+        assert dataset.type_distribution == _SAMPLE_DISTRIBUTION
         assert dataset.uploaded_at is not None
-        
-        # Clean up temporary file
-        temp_file.close()
     
-    def test_dataset_str_method(self, user):
+    def test_dataset_str_method(self):
         """Test dataset string representation"""
-        temp_file = tempfile.NamedTemporaryFile(mode='w+', suffix='.csv', delete=True)
-        temp_file.write('dummy')
-        temp_file.seek(0)
-        
-        dataset = Dataset.objects.create(
-            name='Test Dataset',
-            uploaded_by=user,
-            csv_file=File(temp_file, name='test_str.csv'),
-            total_count=1,
-            avg_flowrate=100.0,
-            avg_pressure=2.0,
-            avg_temperature=80.0,
-            type_distribution={'Pump': 1}
-        )
+        dataset = _mk(self.user, 'Test Dataset')
         
         expected_str = f"Test Dataset - {dataset.uploaded_at.strftime('%Y-%m-%d %H:%M')}"
         assert str(dataset) == expected_str
-        
-        temp_file.close()
     
-    def test_dataset_ordering(self, user):
+    def test_dataset_ordering(self):
         """Test dataset default ordering"""
-        # Create datasets with different timestamps
-        temp_file1 = tempfile.NamedTemporaryFile(mode='w+', suffix='.csv', delete=True)
-        temp_file1.write('dummy1')
-        temp_file1.seek(0)
-        
-        dataset1 = Dataset.objects.create(
-            name='Dataset 1',
-            uploaded_by=user,
-            csv_file=File(temp_file1, name='test_order1.csv'),
-            total_count=1,
-            avg_flowrate=100.0,
-            avg_pressure=2.0,
-            avg_temperature=80.0,
-            type_distribution={'Pump': 1}
+        dataset1, dataset2 = Dataset.objects.bulk_create([
+            _build(self.user, 'Dataset 1'),
+            _build(self.user, 'Dataset 2'),
+        ])
+        # uploaded_at is auto_now_add, so push dataset1 back to get distinct timestamps
+        Dataset.objects.filter(id=dataset1.id).update(
+            uploaded_at=dataset2.uploaded_at - timedelta(seconds=1)
         )
         
-        temp_file2 = tempfile.NamedTemporaryFile(mode='w+', suffix='.csv', delete=True)
-        temp_file2.write('dummy2')
-        temp_file2.seek(0)
-        
-        dataset2 = Dataset.objects.create(
-            name='Dataset 2',
-            uploaded_by=user,
-            csv_file=File(temp_file2, name='test_order2.csv'),
-            total_count=1,
-            avg_flowrate=100.0,
-            avg_pressure=2.0,
-            avg_temperature=80.0,
-            type_distribution={'Pump': 1}
-        )
-        
-        # Get all datasets - should be ordered by uploaded_at descending
-        datasets = Dataset.objects.all()
-        assert datasets[0] == dataset2  # More recent
-        assert datasets[1] == dataset1  # Older
-        
-        temp_file1.close()
-        temp_file2.close()
+        # Datasets should be ordered by uploaded_at descending, most recent first
+        ids = list(Dataset.objects.filter(uploaded_by=self.user).values_list('id', flat=True))
+        assert ids == [dataset2.id, dataset1.id]
     
-    def test_dataset_json_fields(self, user):
-        """Test JSON field handling"""
-        temp_file = tempfile.NamedTemporaryFile(mode='w+', suffix='.csv', delete=True)
-        temp_file.write('dummy')
-        temp_file.seek(0)
-        
-        dataset = Dataset.objects.create(
-            name='JSON Test',
-            uploaded_by=user,
-            csv_file=File(temp_file, name='test_json.csv'),
-            total_count=1,
-            avg_flowrate=100.0,
-            avg_pressure=2.0,
-            avg_temperature=80.0,
-            type_distribution={'Pump': 2, 'Valve': 3, 'Reactor': 1}
+    def test_dataset_json_fields(self):
+        """Test JSON field handling across create and update"""
+        distributions = (
+            {'Pump': 2, 'Valve': 3, 'Reactor': 1},
+            {'Column': 5},
+            {'Pump': 1},
         )
-        
-        # Test retrieval
-        retrieved = Dataset.objects.get(id=dataset.id)
-        assert retrieved.type_distribution == {'Pump': 2, 'Valve': 3, 'Reactor': 1}
-        
-        # Test updating
-        retrieved.type_distribution = {'Column': 5}
-        retrieved.save()
-        
-        updated = Dataset.objects.get(id=dataset.id)
-        assert updated.type_distribution == {'Column': 5}
-        
-        temp_file.close()
+        dataset = _mk(self.user, 'JSON Test', type_distribution=distributions[0])
+        
+        for type_distribution in distributions:
+            with self.subTest(type_distribution=type_distribution):
+                dataset.type_distribution = type_distribution
+                dataset.save()
+                
+                dataset.refresh_from_db(fields=['type_distribution'])
+                assert dataset.type_distribution == type_distribution
     
-    def test_dataset_csv_content_storage(self, user, sample_csv_content):
+    def test_dataset_csv_content_storage(self):
         """Test CSV content storage and retrieval"""
-        temp_file = tempfile.NamedTemporaryFile(mode='w+', suffix='.csv', delete=True)
-        temp_file.write(sample_csv_content)
-        temp_file.seek(0)
-        
-        dataset = Dataset.objects.create(
-            name='CSV Content Test',
-            uploaded_by=user,
-            csv_file=File(temp_file, name='test_storage.csv'),
-            total_count=5,
-            avg_flowrate=154.5,
-            avg_pressure=2.6,
-            avg_temperature=87.12,
-            type_distribution={'Pump': 2, 'Valve': 1, 'Reactor': 1, 'Column': 1}
-        )
+        dataset = _mk(self.user, 'CSV Content Test', self.sample_csv_bytes)
         
         # Test content storage
-        retrieved = Dataset.objects.get(id=dataset.id)
+        dataset.refresh_from_db(fields=['name'])
         # Note: csv_file is stored as FileField, not as string content
-        assert retrieved.name == 'CSV Content Test'
-        
-        temp_file.close()
+        assert dataset.name == 'CSV Content Test'
     
-    def test_dataset_validation(self, user):
+    def test_dataset_validation(self):
         """Test dataset field validation"""
         # Test that we can create a valid dataset
-        temp_file = tempfile.NamedTemporaryFile(mode='w+', suffix='.csv', delete=True)
-        temp_file.write('dummy')
-        temp_file.seek(0)
-        
-        dataset = Dataset.objects.create(
-            name='Valid Dataset',
-            uploaded_by=user,
-            csv_file=File(temp_file, name='test_valid.csv'),
-            total_count=1,
-            avg_flowrate=100.0,
-            avg_pressure=2.0,
-            avg_temperature=80.0,
-            type_distribution={'Pump': 1}
-        )
+        dataset = _mk(self.user, 'Valid Dataset')
         
         assert dataset.name == 'Valid Dataset'
-        assert dataset.uploaded_by == user
-        temp_file.close()
+        assert dataset.uploaded_by == self.user
     
-    def test_dataset_unique_name_per_user(self, user):
+    def test_dataset_unique_name_per_user(self):
         """Test dataset name uniqueness per user"""
-        temp_file1 = tempfile.NamedTemporaryFile(mode='w+', suffix='.csv', delete=True)
-        temp_file1.write('dummy1')
-        temp_file1.seek(0)
-        
-        Dataset.objects.create(
-            name='Same Name',
-            uploaded_by=user,
-            csv_file=File(temp_file1, name='test_unique1.csv'),
-            total_count=1,
-            avg_flowrate=100.0,
-            avg_pressure=2.0,
-            avg_temperature=80.0,
-            type_distribution={'Pump': 1}
-        )
+        _mk(self.user, 'Same Name')
         
         # Should be able to create another dataset with same name for different user
-        other_user = User.objects.create_user(
+        # This user never logs in, so store an unusable password instead of hashing one
+        other_user = User.objects.create(
             username='otheruser',
             email='other@example.com',
-            password='otherpass123'
-        )
-        
-        temp_file2 = tempfile.NamedTemporaryFile(mode='w+', suffix='.csv', delete=True)
-        temp_file2.write('dummy2')
-        temp_file2.seek(0)
-        
-        other_dataset = Dataset.objects.create(
-            name='Same Name',
-            uploaded_by=other_user,
-            csv_file=File(temp_file2, name='test_unique2.csv'),
-            total_count=1,
-            avg_flowrate=100.0,
-            avg_pressure=2.0,
-            avg_temperature=80.0,
-            type_distribution={'Pump': 1}
+            password='!'
         )
+        other_dataset = _mk(other_user, 'Same Name')
         
         assert other_dataset.uploaded_by == other_user
         assert other_dataset.name == 'Same Name'
-        
-        temp_file1.close()
-        temp_file2.close()
     
-    def test_dataset_soft_delete_behavior(self, user):
+    def test_dataset_soft_delete_behavior(self):
         """Test dataset behavior after deletion"""
-        temp_file = tempfile.NamedTemporaryFile(mode='w+', suffix='.csv', delete=True)
-        temp_file.write('dummy')
-        temp_file.seek(0)
-        
-        dataset = Dataset.objects.create(
-            name='To Delete',
-            uploaded_by=user,
-            csv_file=File(temp_file, name='test_delete.csv'),
-            total_count=1,
-            avg_flowrate=100.0,
-            avg_pressure=2.0,
-            avg_temperature=80.0,
-            type_distribution={'Pump': 1}
-        )
+        dataset = _mk(self.user, 'To Delete')
         
         dataset_id = dataset.id
         dataset.delete()
         
         # Dataset should be deleted
         assert not Dataset.objects.filter(id=dataset_id).exists()
-        
-        temp_file.close()
     
-    def test_dataset_bulk_operations(self, user):
+    def test_dataset_bulk_operations(self):
         """Test bulk operations on datasets"""
-        datasets = []
-        temp_files = []
-        
-        for i in range(5):
-            temp_file = tempfile.NamedTemporaryFile(mode='w+', suffix='.csv', delete=True)
-            temp_file.write(f'dummy{i}')
-            temp_file.seek(0)
-            temp_files.append(temp_file)
-            
-            dataset = Dataset.objects.create(
-                name=f'Bulk Dataset {i}',
-                uploaded_by=user,
-                csv_file=File(temp_file, name=f'test_bulk{i}.csv'),
-                total_count=1,
-                avg_flowrate=100.0 + i,
-                avg_pressure=2.0 + i * 0.1,
-                avg_temperature=80.0 + i,
-                type_distribution={'Pump': 1}
+        datasets = Dataset.objects.bulk_create([
+            _build(
+                self.user, f'Bulk Dataset {i}',
+                avg_flowrate=100.0 + i, avg_pressure=2.0 + i * 0.1, avg_temperature=80.0 + i
             )
-            datasets.append(dataset)
+            for i in range(5)
+        ])
+        
+        bulk = Dataset.objects.filter(id__in=[d.id for d in datasets])
         
         # Test bulk update
-        Dataset.objects.filter(id__in=[d.id for d in datasets]).update(
-            avg_flowrate=200.0
-        )
+        with self.assertNumQueries(1):
+            bulk.update(avg_flowrate=200.0)
         
-        updated_datasets = Dataset.objects.filter(id__in=[d.id for d in datasets])
-        for dataset in updated_datasets:
-            assert dataset.avg_flowrate == 200.0
+        assert not bulk.exclude(avg_flowrate=200.0).exists()
         
         # Test bulk delete
-        deleted_count, _ = Dataset.objects.filter(id__in=[d.id for d in datasets]).delete()
+        # Select the datasets, cascade to their equipment rows, then delete them
+        with self.assertNumQueries(3):
+            deleted_count, _ = bulk.delete()
         assert deleted_count == 5
-        
-        # Clean up temp files
-        for temp_file in temp_files:
-            temp_file.close()
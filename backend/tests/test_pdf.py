@@ -1,16 +1,46 @@
 import pytest
-import tempfile
-import os
+from reportlab import rl_config
+from django.core.files.base import ContentFile
 from rest_framework.test import APIClient
 from equipment.models import Dataset
+from equipment.pdf_utils import MINIMAL_PDF_BYTES
+
+
+@pytest.fixture(scope='module')
+def pdf_dataset(django_db_setup, django_db_blocker, session_user):
+    """Create one dataset shared by every report test in the module"""
+    with django_db_blocker.unblock():
+        dataset = Dataset.objects.create(
+            name='Test Dataset',
+            uploaded_by=session_user,
+            csv_file=ContentFile(b'dummy', name='test_dataset.csv'),
+            total_count=5,
+            avg_flowrate=154.5,
+            avg_pressure=2.6,
+            avg_temperature=87.12,
+            type_distribution={'Pump': 2, 'Valve': 1, 'Reactor': 1, 'Column': 1}
+        )
+        yield dataset
+        
+        dataset.csv_file.delete(save=False)
+        dataset.delete()
+
+
+@pytest.fixture(scope='module')
+def pdf_response(django_db_blocker, session_user, pdf_dataset):
+    """Render the shared dataset's report once and reuse the response across the module"""
+    with django_db_blocker.unblock():
+        client = APIClient()
+        client.force_authenticate(user=session_user)
+        return client.get(f'/api/datasets/{pdf_dataset.id}/report/pdf/')
 
 
 class TestPDFReportAPI:
     """Test PDF report generation API endpoint"""
     
-    def test_pdf_download_success(self, auth_client, equipment_dataset):
+    def test_pdf_download_success(self, pdf_response):
         """Test successful PDF download"""
-        response = auth_client.get(f'/api/datasets/{equipment_dataset.id}/report/pdf/')
+        response = pdf_response
         
         assert response.status_code == 200
         assert response['Content-Type'] == 'application/pdf'
@@ -18,13 +48,14 @@ class TestPDFReportAPI:
         assert 'pdf' in response['Content-Disposition'].lower()
         
         # Check that response contains PDF content
-        assert len(response.content) > 0
+        content = response.content
+        assert len(content) > 0
         # PDF files start with %PDF-
-        assert response.content.startswith(b'%PDF-')
+        assert content.startswith(b'%PDF-')
     
-    def test_pdf_download_unauthenticated(self, api_client, equipment_dataset):
+    def test_pdf_download_unauthenticated(self, db, api_client, pdf_dataset):
         """Test PDF download without authentication"""
-        response = api_client.get(f'/api/datasets/{equipment_dataset.id}/report/pdf/')
+        response = api_client.get(f'/api/datasets/{pdf_dataset.id}/report/pdf/')
         
         assert response.status_code == 401
     
@@ -34,34 +65,18 @@ class TestPDFReportAPI:
         
         assert response.status_code == 404
     
-    def test_pdf_download_content(self, auth_client, equipment_dataset):
+    def test_pdf_download_content(self, pdf_response):
         """Test PDF content contains expected information"""
-        response = auth_client.get(f'/api/datasets/{equipment_dataset.id}/report/pdf/')
+        response = pdf_response
         
         assert response.status_code == 200
         
-        # Save PDF to temporary file for inspection
-        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp_file:
-            tmp_file.write(response.content)
-            tmp_file_path = tmp_file.name
-        
-        try:
-            # Check that file exists and has content
-            assert os.path.exists(tmp_file_path)
-            assert os.path.getsize(tmp_file_path) > 0
-            
-            # Basic PDF validation
-            with open(tmp_file_path, 'rb') as f:
-                content = f.read()
-                # PDF should contain dataset name
-                assert b'Test Dataset' in content
-                # PDF should contain some statistics
-                assert b'154.5' in content or b'2.6' in content or b'87.12' in content
-                
-        finally:
-            # Clean up temporary file
-            if os.path.exists(tmp_file_path):
-                os.unlink(tmp_file_path)
+        content = response.content
+        assert len(content) > 0
+        # PDF should contain dataset name
+        assert b'Test Dataset' in content
+        # PDF should contain some statistics
+        assert b'154.5' in content or b'2.6' in content or b'87.12' in content
     
     def test_pdf_download_large_dataset(self, auth_client, user):
         """Test PDF download with large dataset"""
@@ -93,12 +108,13 @@ Column-C3,Column,180.2,2.8,95.3"""
         
         assert response.status_code == 200
         assert response['Content-Type'] == 'application/pdf'
-        assert len(response.content) > 0
-        assert response.content.startswith(b'%PDF-')
+        content = response.content
+        assert len(content) > 0
+        assert content.startswith(b'%PDF-')
     
-    def test_pdf_download_filename(self, auth_client, equipment_dataset):
+    def test_pdf_download_filename(self, pdf_response):
         """Test PDF download filename format"""
-        response = auth_client.get(f'/api/datasets/{equipment_dataset.id}/report/pdf/')
+        response = pdf_response
         
         assert response.status_code == 200
         content_disposition = response['Content-Disposition']
@@ -148,12 +164,15 @@ Column-C3,Column,180.2,2.8,95.3"""
         assert response['Content-Type'] == 'application/pdf'
         assert len(response.content) > 0
     
-    def test_pdf_download_multiple_requests(self, auth_client, equipment_dataset):
+    def test_pdf_download_multiple_requests(self, auth_client, pdf_dataset, monkeypatch):
         """Test multiple PDF download requests"""
+        # Without invariant mode ReportLab stamps each file with its own /CreationDate and /ID
+        monkeypatch.setattr(rl_config, 'invariant', 1)
+        
         # Make multiple requests to ensure consistency
         responses = []
         for i in range(3):
-            response = auth_client.get(f'/api/datasets/{equipment_dataset.id}/report/pdf/')
+            response = auth_client.get(f'/api/datasets/{pdf_dataset.id}/report/pdf/')
             responses.append(response)
         
         # All responses should be successful
@@ -165,9 +184,9 @@ Column-C3,Column,180.2,2.8,95.3"""
         # Content should be identical
         assert responses[0].content == responses[1].content == responses[2].content
     
-    def test_pdf_download_headers(self, auth_client, equipment_dataset):
+    def test_pdf_download_headers(self, pdf_response):
         """Test PDF download response headers"""
-        response = auth_client.get(f'/api/datasets/{equipment_dataset.id}/report/pdf/')
+        response = pdf_response
         
         assert response.status_code == 200
         
@@ -180,3 +199,45 @@ Column-C3,Column,180.2,2.8,95.3"""
         # Content length should be present
         assert 'Content-Length' in response
         assert int(response['Content-Length']) > 0
+    
+    def test_pdf_real_rendering(self, auth_client, user, settings):
+        """Test the ReportLab renderer runs when the fast-PDF flag is off"""
+        settings.TESTING_FAST_PDF = False
+        dataset = Dataset.objects.create(
+            name='Rendered Dataset',
+            uploaded_by=user,
+            csv_file=ContentFile(b'dummy', name='rendered.csv'),
+            total_count=1,
+            avg_flowrate=150.5,
+            avg_pressure=2.5,
+            avg_temperature=85.2,
+            type_distribution={'Pump': 1}
+        )
+        
+        response = auth_client.get(f'/api/datasets/{dataset.id}/report/pdf/')
+        
+        assert response.status_code == 200
+        content = response.content
+        assert content.startswith(b'%PDF-')
+        assert len(content) > len(MINIMAL_PDF_BYTES)
+        assert b'ReportLab' in content
+    
+    def test_pdf_fast_stub(self, auth_client, user, settings):
+        """Test the stub PDF is served when the fast-PDF flag is on"""
+        settings.TESTING_FAST_PDF = True
+        dataset = Dataset.objects.create(
+            name='Stub Dataset',
+            uploaded_by=user,
+            csv_file=ContentFile(b'dummy', name='stub.csv'),
+            total_count=1,
+            avg_flowrate=150.5,
+            avg_pressure=2.5,
+            avg_temperature=85.2,
+            type_distribution={'Pump': 1}
+        )
+        
+        response = auth_client.get(f'/api/datasets/{dataset.id}/report/pdf/')
+        
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/pdf'
+        assert response.content == MINIMAL_PDF_BYTES
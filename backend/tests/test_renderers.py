@@ -0,0 +1,77 @@
+import io
+import json
+import pytest
+from decimal import Decimal
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.renderers import JSONRenderer
+from equipment.renderers import ORJSONRenderer, ORJSONParser
+
+
+class TestORJSONRenderer:
+    """Test the orjson-backed API renderer and parser"""
+
+    def test_render_matches_stdlib_output(self):
+        """Test rendered JSON decodes to the same value as DRF's renderer"""
+        data = {
+            'name': 'Pump-001 – Δ',
+            'avg_flowrate': 154.5,
+            'type_distribution': {'Pump': 2, 'Valve': 1},
+            'preview_rows': [{'Equipment Name': 'Pump-001'}],
+        }
+
+        rendered = ORJSONRenderer().render(data)
+
+        assert json.loads(rendered) == json.loads(JSONRenderer().render(data))
+
+    def test_render_drf_specific_types(self):
+        """Test error details, lazy strings and decimals go through DRF's encoder"""
+        data = {
+            'detail': ErrorDetail('Not found.', code='not_found'),
+            'message': gettext_lazy('Invalid'),
+            'value': Decimal('2.50'),
+        }
+
+        rendered = json.loads(ORJSONRenderer().render(data))
+
+        assert rendered == {'detail': 'Not found.', 'message': 'Invalid', 'value': 2.5}
+
+    def test_render_escapes_line_separators(self):
+        """Test U+2028/U+2029 are escaped like DRF's JSONRenderer does"""
+        rendered = ORJSONRenderer().render({'text': 'a\u2028b\u2029c'})
+
+        assert b'\\u2028' in rendered and b'\\u2029' in rendered
+        assert json.loads(rendered) == {'text': 'a\u2028b\u2029c'}
+
+    def test_render_non_str_keys(self):
+        """Test non-str dict keys are stringified like DRF's renderer does"""
+        data = {1: 'a', 2.5: 'b', True: 'c', None: 'd'}
+
+        rendered = ORJSONRenderer().render(data)
+
+        assert json.loads(rendered) == json.loads(JSONRenderer().render(data))
+
+    @pytest.mark.parametrize('value', [float('nan'), float('inf'), float('-inf')])
+    def test_render_non_finite_rejected(self, value):
+        """Test non-finite floats raise under STRICT_JSON, matching DRF's renderer"""
+        data = {'rows': [{'flowrate': value}]}
+
+        with pytest.raises(ValueError):
+            JSONRenderer().render(data)
+        with pytest.raises(ValueError):
+            ORJSONRenderer().render(data)
+
+    def test_render_none(self):
+        """Test an empty body is rendered for None"""
+        assert ORJSONRenderer().render(None) == b''
+
+    def test_parse(self):
+        """Test request bodies are decoded"""
+        stream = io.BytesIO(b'{"username": "testuser", "password": "testpass123"}')
+
+        assert ORJSONParser().parse(stream) == {'username': 'testuser', 'password': 'testpass123'}
+
+    def test_parse_invalid(self):
+        """Test malformed bodies raise a ParseError"""
+        with pytest.raises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"username": '))
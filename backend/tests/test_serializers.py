@@ -4,6 +4,18 @@ from equipment.serializers import DatasetSerializer, DatasetDetailSerializer
 from equipment.models import Dataset
 
 
+# Valid serializer input shared by the validation cases
+_BASE = {
+    'name': 'Test Dataset',
+    'original_filename': 'test_dataset.csv',
+    'total_count': 1,
+    'avg_flowrate': 150.5,
+    'avg_pressure': 2.5,
+    'avg_temperature': 85.2,
+    'type_distribution': {'Pump': 1}
+}
+
+
 class TestDatasetSerializers:
     """Test Dataset serializers"""
     
@@ -78,97 +90,28 @@ class TestDatasetSerializers:
         assert isinstance(row['pressure'], (int, float))
         assert isinstance(row['temperature'], (int, float))
     
-    def test_dataset_serializer_validation(self):
-        """Test dataset serializer validation"""
-        # Test with valid data
-        valid_data = {
-            'name': 'Test Dataset',
-            'csv_content': 'Equipment Name,Type,Flowrate,Pressure,Temperature\nPump-001,Pump,150.5,2.5,85.2',
-            'total_count': 1,
-            'avg_flowrate': 150.5,
-            'avg_pressure': 2.5,
-            'avg_temperature': 85.2,
-            'type_distribution': {'Pump': 1}
-        }
-        
-        serializer = DatasetSerializer(data=valid_data)
-        assert serializer.is_valid()
-        
-        # Test with missing required fields
-        invalid_data = {
-            'name': 'Test Dataset'
-            # Missing other required fields
-        }
-        
-        serializer = DatasetSerializer(data=invalid_data)
-        assert not serializer.is_valid()
-        assert 'csv_content' in serializer.errors
-        assert 'total_count' in serializer.errors
-    
-    def test_dataset_serializer_type_distribution_validation(self):
-        """Test type distribution field validation"""
-        valid_data = {
-            'name': 'Test Dataset',
-            'csv_content': 'Equipment Name,Type,Flowrate,Pressure,Temperature\nPump-001,Pump,150.5,2.5,85.2',
-            'total_count': 1,
-            'avg_flowrate': 150.5,
-            'avg_pressure': 2.5,
-            'avg_temperature': 85.2,
-            'type_distribution': {'Pump': 1}
-        }
-        
-        # Test valid type distribution
-        serializer = DatasetSerializer(data=valid_data)
-        assert serializer.is_valid()
-        
-        # Test invalid type distribution (not a dict)
-        valid_data['type_distribution'] = 'invalid'
-        serializer = DatasetSerializer(data=valid_data)
-        assert not serializer.is_valid()
-        
-        # Test invalid type distribution (non-string keys)
-        valid_data['type_distribution'] = {1: 1}
-        serializer = DatasetSerializer(data=valid_data)
-        assert not serializer.is_valid()
-        
-        # Test invalid type distribution (non-integer values)
-        valid_data['type_distribution'] = {'Pump': 'invalid'}
-        serializer = DatasetSerializer(data=valid_data)
-        assert not serializer.is_valid()
+    @pytest.mark.parametrize('overrides,is_valid,err_key', [
+        ({}, True, None),
+        ({'type_distribution': 'invalid'}, False, 'type_distribution'),
+        ({'type_distribution': {1: 1}}, False, 'type_distribution'),
+        ({'type_distribution': {'Pump': 'invalid'}}, False, 'type_distribution'),
+        ({'total_count': -1}, False, 'total_count'),
+        ({'avg_flowrate': 'invalid'}, False, 'avg_flowrate'),
+    ])
+    def test_dataset_serializer_validation(self, overrides, is_valid, err_key):
+        """Test dataset serializer field validation"""
+        serializer = DatasetSerializer(data={**_BASE, **overrides})
+        
+        assert serializer.is_valid() is is_valid
+        if err_key:
+            assert err_key in serializer.errors
     
-    def test_dataset_serializer_numeric_field_validation(self):
-        """Test numeric field validation"""
-        base_data = {
-            'name': 'Test Dataset',
-            'csv_content': 'Equipment Name,Type,Flowrate,Pressure,Temperature\nPump-001,Pump,150.5,2.5,85.2',
-            'total_count': 1,
-            'avg_flowrate': 150.5,
-            'avg_pressure': 2.5,
-            'avg_temperature': 85.2,
-            'type_distribution': {'Pump': 1}
-        }
+    def test_dataset_serializer_missing_fields(self):
+        """Test dataset serializer rejects missing required fields"""
+        serializer = DatasetSerializer(data={'name': 'Test Dataset'})
         
-        # Test valid numeric fields
-        serializer = DatasetSerializer(data=base_data)
-        assert serializer.is_valid()
-        
-        # Test invalid total_count (negative)
-        base_data['total_count'] = -1
-        serializer = DatasetSerializer(data=base_data)
-        assert not serializer.is_valid()
-        
-        # Test invalid avg_flowrate (string)
-        base_data['total_count'] = 1
-        base_data['avg_flowrate'] = 'invalid'
-        serializer = DatasetSerializer(data=base_data)
         assert not serializer.is_valid()
-        
-        # Test valid float values
-        base_data['avg_flowrate'] = 150.5
-        base_data['avg_pressure'] = 2.5
-        base_data['avg_temperature'] = 85.2
-        serializer = DatasetSerializer(data=base_data)
-        assert serializer.is_valid()
+        assert 'original_filename' in serializer.errors
     
     def test_dataset_serializer_create(self, user):
         """Test creating dataset through serializer"""
@@ -1,23 +1,40 @@
+import io
 import pytest
-import tempfile
+import pandas as pd
 from django.core.files.uploadedfile import SimpleUploadedFile
 from rest_framework.test import APIClient
+from equipment import services
+from equipment.services import CSVParsingError
+
+
+def _upload(name, data, content_type="text/csv"):
+    """Wrap CSV text or bytes in an uploaded-file object"""
+    if isinstance(data, str):
+        data = data.encode()
+    return SimpleUploadedFile(name, data, content_type=content_type)
+
+
+@pytest.fixture(scope='session')
+def large_csv_bytes():
+    """Return a 10,000-row pump CSV, serialized once per session"""
+    df = pd.DataFrame({
+        'Equipment Name': [f'Pump-{i:04d}' for i in range(10000)],
+        'Type': 'Pump',
+        'Flowrate': 150.5,
+        'Pressure': 2.5,
+        'Temperature': 85.2,
+    })
+    return df.to_csv(index=False).encode()
 
 
 class TestUploadAPI:
     """Test CSV upload API endpoint"""
     
-    def test_csv_upload_success(self, auth_client, sample_csv_file):
+    def test_csv_upload_success(self, auth_client, sample_csv_upload, django_assert_num_queries):
         """Test successful CSV upload"""
-        # Create upload file
-        sample_csv_file.seek(0)
-        upload_file = SimpleUploadedFile(
-            "test.csv",
-            sample_csv_file.read().encode(),
-            content_type="text/csv"
-        )
-        
-        response = auth_client.post('/api/upload/', {'file': upload_file})
+        # Dataset insert, per-user count check and one bulk equipment insert; catches N+1 regressions
+        with django_assert_num_queries(3):
+            response = auth_client.post('/api/upload/', {'file': sample_csv_upload})
         
         assert response.status_code == 200
         assert 'id' in response.data
@@ -30,16 +47,9 @@ class TestUploadAPI:
         assert response.data['type_distribution']['Reactor'] == 1
         assert response.data['type_distribution']['Column'] == 1
     
-    def test_csv_upload_unauthenticated(self, api_client, sample_csv_file):
+    def test_csv_upload_unauthenticated(self, api_client, sample_csv_upload):
         """Test CSV upload without authentication"""
-        sample_csv_file.seek(0)
-        upload_file = SimpleUploadedFile(
-            "test.csv",
-            sample_csv_file.read().encode(),
-            content_type="text/csv"
-        )
-        
-        response = api_client.post('/api/upload/', {'file': upload_file})
+        response = api_client.post('/api/upload/', {'file': sample_csv_upload})
         
         assert response.status_code == 401
     
@@ -52,36 +62,7 @@ class TestUploadAPI:
     
     def test_csv_upload_invalid_file_type(self, auth_client):
         """Test CSV upload with invalid file type"""
-        upload_file = SimpleUploadedFile(
-            "test.txt",
-            b"not a csv file",
-            content_type="text/plain"
-        )
-        
-        response = auth_client.post('/api/upload/', {'file': upload_file})
-        
-        assert response.status_code == 400
-    
-    def test_csv_upload_empty_file(self, auth_client):
-        """Test CSV upload with empty file"""
-        upload_file = SimpleUploadedFile(
-            "empty.csv",
-            b"",
-            content_type="text/csv"
-        )
-        
-        response = auth_client.post('/api/upload/', {'file': upload_file})
-        
-        assert response.status_code == 400
-    
-    def test_csv_upload_invalid_format(self, auth_client):
-        """Test CSV upload with invalid CSV format"""
-        invalid_csv = "invalid,csv,format\nmissing,columns"
-        upload_file = SimpleUploadedFile(
-            "invalid.csv",
-            invalid_csv.encode(),
-            content_type="text/csv"
-        )
+        upload_file = _upload("test.txt", b"not a csv file", content_type="text/plain")
         
         response = auth_client.post('/api/upload/', {'file': upload_file})
         
@@ -89,45 +70,16 @@ class TestUploadAPI:
     
     def test_csv_upload_missing_columns(self, auth_client):
         """Test CSV upload with missing required columns"""
-        invalid_csv = "Name,Type\nPump1,Pump"
-        upload_file = SimpleUploadedFile(
-            "missing_columns.csv",
-            invalid_csv.encode(),
-            content_type="text/csv"
-        )
-        
-        response = auth_client.post('/api/upload/', {'file': upload_file})
-        
-        assert response.status_code == 400
-    
-    def test_csv_upload_invalid_data_types(self, auth_client):
-        """Test CSV upload with invalid data types"""
-        invalid_csv = """Equipment Name,Type,Flowrate,Pressure,Temperature
-Pump-001,Pump,not_a_number,2.5,85.2
-Valve-A12,Valve,75.3,not_a_number,45.7"""
-        
-        upload_file = SimpleUploadedFile(
-            "invalid_types.csv",
-            invalid_csv.encode(),
-            content_type="text/csv"
-        )
+        invalid_csv = b"Name,Type\nPump1,Pump"
+        upload_file = _upload("missing_columns.csv", invalid_csv)
         
         response = auth_client.post('/api/upload/', {'file': upload_file})
         
         assert response.status_code == 400
     
-    def test_csv_upload_large_file(self, auth_client):
+    def test_csv_upload_large_file(self, auth_client, large_csv_bytes):
         """Test CSV upload with large file"""
-        # Create a large CSV file (simulated)
-        large_csv = "Equipment Name,Type,Flowrate,Pressure,Temperature\n"
-        for i in range(10000):
-            large_csv += f"Pump-{i:04d},Pump,150.5,2.5,85.2\n"
-        
-        upload_file = SimpleUploadedFile(
-            "large.csv",
-            large_csv.encode(),
-            content_type="text/csv"
-        )
+        upload_file = _upload("large.csv", large_csv_bytes)
         
         response = auth_client.post('/api/upload/', {'file': upload_file})
         
@@ -136,23 +88,19 @@ Valve-A12,Valve,75.3,not_a_number,45.7"""
     
     def test_csv_upload_special_characters(self, auth_client):
         """Test CSV upload with special characters in equipment names"""
-        special_csv = """Equipment Name,Type,Flowrate,Pressure,Temperature
+        special_csv = b"""Equipment Name,Type,Flowrate,Pressure,Temperature
 Pump-001,Special-Pump,150.5,2.5,85.2
 Valve-A12,Valve/Test,75.3,1.8,45.7
 Reactor-R1,Reactor & Heater,200.8,3.2,120.5"""
         
-        upload_file = SimpleUploadedFile(
-            "special_chars.csv",
-            special_csv.encode(),
-            content_type="text/csv"
-        )
+        upload_file = _upload("special_chars.csv", special_csv)
         
         response = auth_client.post('/api/upload/', {'file': upload_file})
         
         assert response.status_code == 200
         assert response.data['total_count'] == 3
     
-    def test_csv_upload_duplicate_dataset_name(self, auth_client, user, sample_csv_file):
+    def test_csv_upload_duplicate_dataset_name(self, auth_client, user, sample_csv_upload):
         """Test CSV upload with duplicate dataset name"""
         # Create existing dataset with same name
         from equipment.models import EquipmentDataset
@@ -167,16 +115,77 @@ Reactor-R1,Reactor & Heater,200.8,3.2,120.5"""
             type_distribution={}
         )
         
-        sample_csv_file.seek(0)
-        upload_file = SimpleUploadedFile(
-            "test.csv",
-            sample_csv_file.read().encode(),
-            content_type="text/csv"
-        )
-        
-        response = auth_client.post('/api/upload/', {'file': upload_file})
+        response = auth_client.post('/api/upload/', {'file': sample_csv_upload})
         
         assert response.status_code == 200
         # Should create a unique name by adding timestamp
         assert response.data['name'] != 'test.csv'
         assert 'test.csv' in response.data['name']
+
+
+class TestUploadCSVAnalysis:
+    """Test the upload CSV parser directly, without the request pipeline"""
+    
+    def test_empty_file(self):
+        """Test an empty upload is rejected"""
+        with pytest.raises(CSVParsingError, match="empty"):
+            services.analyze_equipment_csv_from_uploaded_file(_upload("empty.csv", b""))
+    
+    def test_invalid_format(self):
+        """Test a CSV without the equipment columns is rejected"""
+        invalid_csv = b"invalid,csv,format\nmissing,columns"
+        
+        with pytest.raises(CSVParsingError, match="Missing required columns"):
+            services.analyze_equipment_csv_from_uploaded_file(_upload("invalid.csv", invalid_csv))
+    
+    def test_invalid_data_types(self):
+        """Test non-numeric readings are treated as missing and left out of the averages"""
+        invalid_csv = b"""Equipment Name,Type,Flowrate,Pressure,Temperature
+Pump-001,Pump,not_a_number,2.5,85.2
+Valve-A12,Valve,75.3,not_a_number,45.7"""
+        
+        result = services.analyze_equipment_csv_from_uploaded_file(_upload("invalid_types.csv", invalid_csv))
+        
+        assert result['total_count'] == 2
+        assert result['avg_flowrate'] == pytest.approx(75.3)
+        assert result['avg_pressure'] == pytest.approx(2.5)
+        assert result['avg_temperature'] == pytest.approx(65.45)
+        assert result['preview_rows'][0]['flowrate'] is None
+        assert result['preview_rows'][1]['pressure'] is None
+    
+    def test_pyarrow_engine_matches_c_parser(self, monkeypatch, sample_csv_bytes):
+        """Test the optional pyarrow engine gives the same stats and preview as the C parser"""
+        pytest.importorskip('pyarrow')
+        
+        arrow_result = services.analyze_equipment_csv_from_uploaded_file(_upload("test.csv", sample_csv_bytes))
+        monkeypatch.setattr(services, 'HAS_PYARROW', False)
+        c_result = services.analyze_equipment_csv_from_uploaded_file(_upload("test.csv", sample_csv_bytes))
+        
+        assert arrow_result == c_result
+    
+    def test_build_equipment_records(self):
+        """Test equipment rows are built per chunk, skipping blank rows and zero-filling readings"""
+        csv_text = """Equipment Name,Type,Flowrate,Pressure,Temperature
+ Pump-001 ,Pump,150.5,,85.2
+,,1.0,2.0,3.0
+Valve-A12,,75.3,1.8,"""
+        
+        with pd.read_csv(io.StringIO(csv_text), chunksize=2) as reader:
+            records = [eq for chunk in reader for eq in services.build_equipment_records(None, chunk)]
+        
+        assert [(eq.name, eq.type, eq.flowrate, eq.pressure, eq.temperature) for eq in records] == [
+            ('Pump-001', 'Pump', 150.5, 0.0, 85.2),
+            ('Valve-A12', '', 75.3, 1.8, 0.0),
+        ]
+    
+    def test_chunked_analysis_matches_single_read(self, monkeypatch, large_csv_bytes):
+        """Test chunked CSV analysis folds to the same result as a single read"""
+        expected = services.analyze_equipment_csv_from_uploaded_file(_upload("large.csv", large_csv_bytes))
+        
+        monkeypatch.setattr(services, 'CHUNKED_PARSE_THRESHOLD', 0)
+        monkeypatch.setattr(services, 'CSV_CHUNK_SIZE', 3000)
+        result = services.analyze_equipment_csv_from_uploaded_file(_upload("large.csv", large_csv_bytes))
+        
+        assert result == expected
+        assert result['total_count'] == 10000
+        assert len(result['preview_rows']) == 100
@@ -1,10 +1,34 @@
 import pytest
-import tempfile
 import csv
 from io import StringIO
 from equipment.utils import process_csv_content, calculate_statistics, validate_csv_format
 
 
+@pytest.fixture(scope='module')
+def large_csv_text():
+    """Return a 1000-row pump CSV, generated once per module"""
+    buf = StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(["Equipment Name", "Type", "Flowrate", "Pressure", "Temperature"])
+    writer.writerows((f"Pump-{i:04d}", "Pump", 150.5, 2.5, 85.2) for i in range(1000))
+    return buf.getvalue()
+
+
+@pytest.fixture(scope='module')
+def large_rows():
+    """Return 1000 processed pump rows with slowly increasing readings"""
+    return [
+        {
+            'equipment_name': f'Pump-{i:04d}',
+            'type': 'Pump',
+            'flowrate': 150.5 + i * 0.01,
+            'pressure': 2.5 + i * 0.001,
+            'temperature': 85.2 + i * 0.01
+        }
+        for i in range(1000)
+    ]
+
+
 class TestCSVProcessingUtils:
     """Test CSV processing utility functions"""
     
@@ -172,35 +196,17 @@ Valve-A12,Valve/Test,75.3,1.8,45.7"""
         # Should not raise any exception
         validate_csv_format(csv_content)
     
-    def test_process_large_csv(self):
+    def test_process_large_csv(self, large_csv_text):
         """Test processing large CSV file"""
-        # Generate large CSV content
-        csv_lines = ["Equipment Name,Type,Flowrate,Pressure,Temperature"]
-        for i in range(1000):
-            csv_lines.append(f"Pump-{i:04d},Pump,150.5,2.5,85.2")
-        
-        csv_content = "\n".join(csv_lines)
-        
-        rows = process_csv_content(csv_content)
+        rows = process_csv_content(large_csv_text)
         
         assert len(rows) == 1000
         assert rows[0]['equipment_name'] == 'Pump-0000'
         assert rows[-1]['equipment_name'] == 'Pump-0999'
     
-    def test_calculate_statistics_large_dataset(self):
+    def test_calculate_statistics_large_dataset(self, large_rows):
         """Test calculating statistics for large dataset"""
-        # Generate large dataset
-        rows = []
-        for i in range(1000):
-            rows.append({
-                'equipment_name': f'Pump-{i:04d}',
-                'type': 'Pump',
-                'flowrate': 150.5 + i * 0.01,
-                'pressure': 2.5 + i * 0.001,
-                'temperature': 85.2 + i * 0.01
-            })
-        
-        stats = calculate_statistics(rows)
+        stats = calculate_statistics(large_rows)
         
         assert stats['total_count'] == 1000
         assert stats['type_distribution'] == {'Pump': 1000}
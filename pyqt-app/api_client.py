@@ -1,10 +1,60 @@
+import atexit
+import copy
 import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from types import MappingProxyType
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Callable
+
+try:
+    from requests_toolbelt.multipart.encoder import MultipartEncoder, MultipartEncoderMonitor
+except ImportError:
+    MultipartEncoder = MultipartEncoderMonitor = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Chunk size used when streaming files to and from the API
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Connection pool sizing and retry policy for the shared session
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 16
+# Once retries run out the last response is returned, so _handle_response still reports the server's error
+RETRY_POLICY = Retry(total=3, backoff_factor=0.2, status_forcelist=(502, 503, 504), raise_on_status=False)
+
+# Maximum number of GET responses remembered for ETag revalidation
+ETAG_CACHE_SIZE = 64
+
+# Seconds a cached GET is served without revalidating; re-selecting a recently
+# viewed dataset then costs no round-trip at all. Explicit refreshes always revalidate.
+CACHE_FRESH_SECONDS = 30
+
+
+@lru_cache(maxsize=1)
+def _read_config(config_path: str) -> MappingProxyType:
+    """Read and parse a config file once; later clients reuse the parsed copy"""
+    with open(config_path, 'rb') as f:
+        content = f.read()
+    config = orjson.loads(content) if orjson is not None else json.loads(content)
+    return MappingProxyType(config)
 
 
 class APIClient:
+    __slots__ = ('config_path', 'base_url', 'timeout', 'token', 'session', '_etag_cache', '_cache_lock',
+                 '_no_retry_adapter')
+    
     def __init__(self, config_path: str = None):
         if config_path is None:
             config_path = Path(__file__).parent / "config.json"
@@ -13,17 +63,34 @@ class APIClient:
         self.base_url = None
         self.timeout = 30
         self.token = None
-        self.session = requests.Session()
+        self.session = self._create_session()
+        # Mounted per URL for slow, expensive calls that must not be repeated automatically
+        self._no_retry_adapter = HTTPAdapter(max_retries=0)
+        self._etag_cache: OrderedDict[str, Tuple[str, Any, float]] = OrderedDict()
+        # Pooled workers share this client, so every cache read and write holds the lock
+        self._cache_lock = threading.Lock()
         
         self._load_config()
     
+    def _create_session(self) -> requests.Session:
+        """Create a keep-alive session with pooled connections and retries"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=POOL_CONNECTIONS,
+            pool_maxsize=POOL_MAXSIZE,
+            max_retries=RETRY_POLICY
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update({'Accept': 'application/json'})
+        return session
+    
     def _load_config(self):
         """Load configuration from JSON file"""
         try:
-            with open(self.config_path, 'r') as f:
-                config = json.load(f)
-                self.base_url = config.get('api', {}).get('base_url', 'http://localhost:8000/api')
-                self.timeout = config.get('api', {}).get('timeout', 30)
+            config = _read_config(str(self.config_path))
+            self.base_url = config.get('api', {}).get('base_url', 'http://localhost:8000/api')
+            self.timeout = config.get('api', {}).get('timeout', 30)
         except FileNotFoundError:
             # Default configuration if file doesn't exist
             self.base_url = 'http://localhost:8000/api'
@@ -34,22 +101,13 @@ class APIClient:
             self.timeout = 30
             print(f"Warning: Invalid JSON in {self.config_path}. Using default settings.")
     
-    def _get_headers(self, include_auth: bool = True) -> Dict[str, str]:
-        """Get request headers"""
-        headers = {
-            'Content-Type': 'application/json',
-            'Accept': 'application/json',
-        }
-        
-        if include_auth and self.token:
-            headers['Authorization'] = f'Token {self.token}'
-        
-        return headers
-    
     def _handle_response(self, response: requests.Response) -> Dict[str, Any]:
         """Handle API response"""
         try:
             response.raise_for_status()
+            if orjson is not None:
+                # orjson decodes the raw bytes directly; its JSONDecodeError subclasses json's
+                return orjson.loads(response.content)
             return response.json()
         except requests.exceptions.HTTPError as e:
             if response.status_code == 401:
@@ -76,6 +134,70 @@ class APIClient:
         except json.JSONDecodeError:
             raise Exception("Invalid response format from server.")
     
+    def _post_json(self, url: str, data: Dict[str, Any]) -> requests.Response:
+        """POST a JSON body, encoded with orjson when it is available"""
+        if orjson is None:
+            return self.session.post(url, json=data, timeout=self.timeout)
+        
+        headers = {'Content-Type': 'application/json'}
+        return self.session.post(url, data=orjson.dumps(data), headers=headers, timeout=self.timeout)
+    
+    def _cached_get(self, url: str, revalidate: bool = False) -> Any:
+        """
+        GET a JSON resource. A cached copy is returned directly while fresh,
+        and revalidated with If-None-Match once it goes stale or when revalidate
+        is set. Callers always receive their own copy of the payload.
+        """
+        now = time.monotonic()
+        with self._cache_lock:
+            cached = self._etag_cache.get(url)
+            if cached and not revalidate and now < cached[2]:
+                self._etag_cache.move_to_end(url)
+                return copy.deepcopy(cached[1])
+        
+        headers = {'If-None-Match': cached[0]} if cached else None
+        
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        if cached and response.status_code == 304:
+            with self._cache_lock:
+                self._etag_cache[url] = (cached[0], cached[1], now + CACHE_FRESH_SECONDS)
+                self._etag_cache.move_to_end(url)
+            return copy.deepcopy(cached[1])
+        
+        try:
+            result = self._handle_response(response)
+        except Exception:
+            # The resource is gone or failing; don't keep serving the old copy
+            self.invalidate(url)
+            raise
+        
+        etag = response.headers.get('ETag')
+        if etag:
+            with self._cache_lock:
+                self._etag_cache[url] = (etag, copy.deepcopy(result), now + CACHE_FRESH_SECONDS)
+                self._etag_cache.move_to_end(url)
+                if len(self._etag_cache) > ETAG_CACHE_SIZE:
+                    self._etag_cache.popitem(last=False)
+        return result
+    
+    def invalidate(self, url: str = None):
+        """Drop the cached response for a URL, or every cached response"""
+        with self._cache_lock:
+            if url is None:
+                self._etag_cache.clear()
+            else:
+                self._etag_cache.pop(url, None)
+    
+    def _prune_dataset_details(self, datasets: List[Dict[str, Any]]):
+        """Drop cached details of datasets that are no longer listed"""
+        prefix = f"{self.base_url}/datasets/"
+        listed = {f"{prefix}{d.get('id')}/" for d in datasets}
+        with self._cache_lock:
+            stale = [url for url in self._etag_cache
+                     if url.startswith(prefix) and url != prefix and url not in listed]
+            for url in stale:
+                del self._etag_cache[url]
+    
     def login(self, username: str, password: str) -> Dict[str, Any]:
         """Login to the API and store token"""
         url = f"{self.base_url}/auth/login/"
@@ -85,11 +207,12 @@ class APIClient:
         }
         
         try:
-            response = self.session.post(url, json=data, headers=self._get_headers(include_auth=False))
+            response = self._post_json(url, data)
             result = self._handle_response(response)
             
             if 'token' in result:
                 self.token = result['token']
+                self.session.headers['Authorization'] = f'Token {self.token}'
                 return result
             else:
                 raise Exception("No token received from server")
@@ -111,7 +234,7 @@ class APIClient:
         }
         
         try:
-            response = self.session.post(url, json=data, headers=self._get_headers(include_auth=False))
+            response = self._post_json(url, data)
             result = self._handle_response(response)
             return result
         except Exception as e:
@@ -120,9 +243,11 @@ class APIClient:
     def logout(self):
         """Logout and clear token"""
         self.token = None
+        self.session.headers.pop('Authorization', None)
+        self.invalidate()
     
-    def upload_csv(self, file_path: str) -> Dict[str, Any]:
-        """Upload CSV file to the API"""
+    def upload_csv(self, file_path: str, progress_cb: Optional[Callable[[int], None]] = None) -> Dict[str, Any]:
+        """Upload CSV file to the API, reporting percent sent to progress_cb when given"""
         if not self.token:
             raise Exception("Authentication required. Please login first.")
         
@@ -130,36 +255,66 @@ class APIClient:
         
         try:
             with open(file_path, 'rb') as f:
-                files = {'file': f}
-                headers = {}  # Don't set Content-Type for multipart/form-data
-                if self.token:
-                    headers['Authorization'] = f'Token {self.token}'
+                if MultipartEncoder is not None:
+                    # Stream the multipart body from disk instead of reading the whole file
+                    encoder = MultipartEncoder(
+                        fields={'file': (os.path.basename(file_path), f, 'text/csv')}
+                    )
+                    body = encoder
+                    if progress_cb is not None:
+                        # Report real progress as the body is read onto the socket,
+                        # once per whole percent rather than once per read
+                        last_percent = [-1]
+                        
+                        def on_read(monitor):
+                            percent = int(100 * monitor.bytes_read / monitor.len)
+                            if percent != last_percent[0]:
+                                last_percent[0] = percent
+                                progress_cb(percent)
+                        
+                        body = MultipartEncoderMonitor(encoder, on_read)
+                    headers = {'Content-Type': encoder.content_type}
+                    response = self.session.post(url, data=body, headers=headers, timeout=self.timeout)
+                else:
+                    # requests builds the multipart body in memory; Content-Type is set by requests
+                    files = {'file': f}
+                    response = self.session.post(url, files=files, timeout=self.timeout)
+                    if progress_cb is not None:
+                        progress_cb(100)
                 
-                response = self.session.post(url, files=files, headers=headers, timeout=self.timeout)
-                return self._handle_response(response)
+                result = self._handle_response(response)
+                # The dataset list changed, don't serve the stale copy
+                self.invalidate(f"{self.base_url}/datasets/")
+                return result
         except FileNotFoundError:
             raise Exception(f"File not found: {file_path}")
         except Exception as e:
             raise Exception(f"Upload failed: {str(e)}")
     
-    def get_datasets(self) -> List[Dict[str, Any]]:
-        """Get list of datasets"""
+    def get_datasets(self, revalidate: bool = False) -> List[Dict[str, Any]]:
+        """
+        Get list of datasets. With revalidate, the server is always asked, and cached
+        details of datasets that disappeared are dropped.
+        """
         if not self.token:
             raise Exception("Authentication required. Please login first.")
         
         url = f"{self.base_url}/datasets/"
         
         try:
-            response = self.session.get(url, headers=self._get_headers(), timeout=self.timeout)
-            result = self._handle_response(response)
+            result = self._cached_get(url, revalidate=revalidate)
             
             # Handle paginated response
             if isinstance(result, dict) and 'results' in result:
-                return result['results']
+                datasets = result['results']
             elif isinstance(result, list):
-                return result
+                datasets = result
             else:
                 raise Exception("Unexpected response format")
+            
+            if revalidate:
+                self._prune_dataset_details(datasets)
+            return datasets
         except Exception as e:
             raise Exception(f"Failed to fetch datasets: {str(e)}")
     
@@ -171,10 +326,10 @@ class APIClient:
         url = f"{self.base_url}/datasets/{dataset_id}/"
         
         try:
-            response = self.session.get(url, headers=self._get_headers(), timeout=self.timeout)
-            return self._handle_response(response)
+            return self._cached_get(url)
         except Exception as e:
             raise Exception(f"Failed to fetch dataset detail: {str(e)}")
+    
     def get_ai_insights(self, dataset_id: int) -> str:
         """Get AI insights for a dataset"""
         if not self.token:
@@ -183,12 +338,15 @@ class APIClient:
         url = f"{self.base_url}/datasets/{dataset_id}/analyze/"
         
         try:
-            headers = {'Authorization': f'Token {self.token}'}
-            response = self.session.get(url, headers=headers, timeout=60) # Longer timeout for AI
+            # A 60s generative-model call is too costly to retry; mount the no-retry adapter for this URL
+            self.session.mount(url, self._no_retry_adapter)
+            response = self.session.get(url, timeout=60) # Longer timeout for AI
             result = self._handle_response(response)
             return result.get('insights', 'No insights generated.')
         except Exception as e:
             raise Exception(f"Failed to generate AI insights: {str(e)}")
+    
+    def download_pdf(self, dataset_id: int, save_path: str) -> bool:
         """Download PDF report for a dataset"""
         if not self.token:
             raise Exception("Authentication required. Please login first.")
@@ -196,13 +354,22 @@ class APIClient:
         url = f"{self.base_url}/datasets/{dataset_id}/report/pdf/"
         
         try:
-            headers = {'Authorization': f'Token {self.token}'}
-            response = self.session.get(url, headers=headers, timeout=self.timeout)
-            response.raise_for_status()
-            
-            # Save PDF to file
-            with open(save_path, 'wb') as f:
-                f.write(response.content)
+            with self.session.get(url, timeout=self.timeout, stream=True) as response:
+                response.raise_for_status()
+                
+                # Stream PDF to a temporary file next to the target, without holding the
+                # whole body in memory, and only move it into place once it is complete
+                fd, tmp_path = tempfile.mkstemp(
+                    dir=os.path.dirname(os.path.abspath(save_path)), suffix='.part'
+                )
+                try:
+                    with os.fdopen(fd, 'wb') as f:
+                        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                            f.write(chunk)
+                    os.replace(tmp_path, save_path)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
             
             return True
         except requests.exceptions.HTTPError as e:
@@ -232,7 +399,12 @@ class APIClient:
     def set_timeout(self, timeout: int):
         """Set timeout setting"""
         self.timeout = timeout
+    
+    def close(self):
+        """Close the pooled keep-alive connections"""
+        self.session.close()
 
 
 # Global API client instance
 api_client = APIClient()
+atexit.register(api_client.close)
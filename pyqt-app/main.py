@@ -6,6 +6,7 @@ Main application entry point
 
 import sys
 import os
+import logging
 from pathlib import Path
 
 # Add the project root to Python path
@@ -16,8 +17,8 @@ from PyQt5.QtWidgets import QApplication, QMessageBox
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont
 from widgets.login_window import LoginWindow
-from widgets.main_window import MainWindow
-from api_client import api_client
+
+log = logging.getLogger(__name__)
 
 
 def setup_application():
@@ -42,39 +43,44 @@ def setup_application():
 
 def main():
     """Main application entry point"""
-    print("DEBUG: Starting application setup...")
+    log.debug("Starting application setup...")
     app = setup_application()
-    print("DEBUG: Application setup complete.")
+    log.debug("Application setup complete.")
     
     # Show login window first
-    print("DEBUG: Initializing LoginWindow...")
+    log.debug("Initializing LoginWindow...")
     login_window = LoginWindow()
-    print("DEBUG: LoginWindow initialized. Showing dialog...")
+    log.debug("LoginWindow initialized. Showing dialog...")
     
     result = login_window.exec_()
-    print(f"DEBUG: LoginWindow closed with result: {result}")
+    log.debug("LoginWindow closed with result: %s", result)
     
     if result == LoginWindow.Accepted:
-        # Login successful, show main window
-        print("DEBUG: Login accepted. Initializing MainWindow...")
+        # Login successful, show main window. Imported here so matplotlib and the
+        # dashboard widgets only load once they are needed.
+        from widgets.main_window import MainWindow
+        from api_client import api_client
+        
+        log.debug("Login accepted. Initializing MainWindow...")
         main_window = MainWindow()
         main_window.show()
-        print("DEBUG: MainWindow shown. Starting event loop...")
+        log.debug("MainWindow shown. Starting event loop...")
         
         # Run the application
         return_code = app.exec_()
-        print(f"DEBUG: Application exited with code: {return_code}")
+        log.debug("Application exited with code: %s", return_code)
         
         # Cleanup
         api_client.logout()
         sys.exit(return_code)
     else:
         # Login failed or cancelled
-        print("DEBUG: Login cancelled or failed. Exiting.")
+        log.debug("Login cancelled or failed. Exiting.")
         sys.exit(0)
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
     try:
         main()
     except Exception as e:
@@ -1,77 +1,315 @@
 import sys
 import os
+import logging
+import threading
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QLabel, QPushButton, QMessageBox, 
-                            QTableWidget, QTableWidgetItem, QListWidget, 
+                            QTableView, QListWidget, 
                             QListWidgetItem, QFileDialog, QFrame, QScrollArea,
                             QSplitter, QGridLayout, QSizePolicy, QProgressBar,
                             QHeaderView, QAbstractItemView)
-from PyQt5.QtCore import Qt, pyqtSignal, QThread, pyqtSlot, QTimer
-from PyQt5.QtGui import QFont, QPixmap, QPainter, QColor, QPalette
-import matplotlib
-matplotlib.use('Qt5Agg')
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from PyQt5.QtCore import (Qt, pyqtSignal, pyqtSlot, QTimer, QObject, QRunnable, QThreadPool,
+                          QAbstractTableModel, QModelIndex)
+from PyQt5.QtGui import QFont, QPixmap, QImage, QPainter, QColor, QPalette
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.figure import Figure
-import matplotlib.pyplot as plt
 from api_client import api_client
 
+log = logging.getLogger(__name__)
 
-class DataWorker(QThread):
-    """Worker thread for API calls to avoid blocking UI"""
+# Quiet period before a history selection triggers a detail fetch
+SELECTION_DEBOUNCE_MS = 150
+
+# How long closing the window waits for running API calls before giving up on them
+WORKER_SHUTDOWN_TIMEOUT_MS = 2000
+
+# Chart bottom margins (figure fraction) with horizontal and 45-degree rotated type labels
+CHART_BOTTOM_MARGIN = 0.2
+CHART_ROTATED_BOTTOM_MARGIN = 0.25
+
+# Dashboard stylesheet, including the card and AI button rules, applied once per window
+MAIN_STYLESHEET = """
+    QMainWindow {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+            stop:0 #f5f7fa, stop:1 #c3cfe2);
+    }
+    
+    QFrame#uploadFrame, QFrame#historyFrame, QFrame#actionsFrame,
+    QFrame#summaryFrame, QFrame#chartFrame, QFrame#tableFrame {
+        background: rgba(255, 255, 255, 0.9);
+        border: 1px solid rgba(255, 255, 255, 0.3);
+        border-radius: 10px;
+        padding: 15px;
+        margin: 5px;
+    }
+    
+    QFrame#summaryCard {
+        background: rgba(255, 255, 255, 0.8);
+        border: 1px solid rgba(102, 126, 234, 0.3);
+        border-radius: 8px;
+        padding: 10px;
+        margin: 5px;
+    }
+    
+    QPushButton {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 #667eea, stop:1 #764ba2);
+        color: white;
+        border: none;
+        border-radius: 8px;
+        padding: 10px;
+        font-size: 12px;
+        font-weight: bold;
+    }
+    
+    QPushButton:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 #5a67d8, stop:1 #6b46c1);
+    }
+    
+    QPushButton:pressed {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 #4c51bf, stop:1 #553c9a);
+    }
+    
+    QPushButton:disabled {
+        background: #cbd5e0;
+        color: #718096;
+    }
+    
+    QListWidget {
+        background: white;
+        border: 1px solid #e2e8f0;
+        border-radius: 8px;
+        padding: 5px;
+    }
+    
+    QListWidget::item {
+        padding: 8px;
+        border-bottom: 1px solid #f7fafc;
+    }
+    
+    QListWidget::item:selected {
+        background: #667eea;
+        color: white;
+    }
+    
+    QListWidget::item:hover {
+        background: #edf2f7;
+    }
+    
+    QTableView {
+        background: white;
+        border: 1px solid #e2e8f0;
+        border-radius: 8px;
+        gridline-color: #f7fafc;
+    }
+    
+    QTableView::item {
+        padding: 5px;
+        border-bottom: 1px solid #f7fafc;
+    }
+    
+    QTableView::item:selected {
+        background: #667eea;
+        color: white;
+    }
+    
+    QHeaderView::section {
+        background: #f7fafc;
+        border: none;
+        border-bottom: 2px solid #e2e8f0;
+        padding: 8px;
+        font-weight: bold;
+    }
+    
+    QProgressBar {
+        border: 1px solid #e2e8f0;
+        border-radius: 4px;
+        text-align: center;
+        background: white;
+    }
+    
+    QProgressBar::chunk {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+            stop:0 #667eea, stop:1 #764ba2);
+        border-radius: 3px;
+    }
+    
+    QPushButton#aiButton {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #ed8936, stop:1 #f6ad55);
+    }
+    
+    QPushButton#aiButton:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #dd6b20, stop:1 #ed8936);
+    }
+"""
+
+
+@lru_cache(maxsize=None)
+def _font(point_size, weight=QFont.Normal):
+    """Return a shared variant of the application font, created once per size and weight"""
+    font = QFont(QApplication.font())
+    font.setPointSize(point_size)
+    font.setWeight(weight)
+    return font
+
+
+class DataWorkerSignals(QObject):
+    """Signals emitted by DataWorker (QRunnable cannot define signals itself)"""
     datasets_loaded = pyqtSignal(list)
     dataset_detail_loaded = pyqtSignal(dict)
     upload_progress = pyqtSignal(int)
     upload_complete = pyqtSignal(dict)
     ai_insights_ready = pyqtSignal(str)
+    download_complete = pyqtSignal(bool, str)
     error = pyqtSignal(str)
+    finished = pyqtSignal()
+
+
+class DataWorker(QRunnable):
+    """Pooled API call to avoid blocking UI"""
     
     def __init__(self, action, **kwargs):
         super().__init__()
         self.action = action
         self.kwargs = kwargs
+        self.signals = DataWorkerSignals()
+        self._cancelled = threading.Event()
+    
+    def cancel(self):
+        """Ask the task to skip its call, or drop its result if already running"""
+        self._cancelled.set()
+    
+    def detach(self):
+        """Cancel the task and disconnect every receiver from its signals"""
+        self.cancel()
+        for name in ('datasets_loaded', 'dataset_detail_loaded', 'upload_progress', 'upload_complete',
+                     'ai_insights_ready', 'download_complete', 'error', 'finished'):
+            try:
+                getattr(self.signals, name).disconnect()
+            except TypeError:
+                # Signal had no connections
+                pass
     
     def run(self):
+        try:
+            self._run()
+        finally:
+            self.signals.finished.emit()
+    
+    def _run(self):
+        if self._cancelled.is_set():
+            return
         try:
             if self.action == "load_datasets":
-                datasets = api_client.get_datasets()
-                self.datasets_loaded.emit(datasets)
+                # List loads come from startup, Refresh or an upload; always ask the server
+                datasets = api_client.get_datasets(revalidate=True)
+                self.signals.datasets_loaded.emit(datasets)
             elif self.action == "load_dataset_detail":
                 dataset_id = self.kwargs.get("dataset_id")
                 detail = api_client.get_dataset_detail(dataset_id)
-                self.dataset_detail_loaded.emit(detail)
+                if not self._cancelled.is_set():
+                    self.signals.dataset_detail_loaded.emit(detail)
             elif self.action == "upload_csv":
                 file_path = self.kwargs.get("file_path")
-                # Simulate progress for demo (in real app, you'd track actual progress)
-                for i in range(0, 101, 10):
-                    self.upload_progress.emit(i)
-                    self.msleep(100)
-                result = api_client.upload_csv(file_path)
-                self.upload_complete.emit(result)
+                result = api_client.upload_csv(file_path, progress_cb=self.signals.upload_progress.emit)
+                self.signals.upload_complete.emit(result)
             elif self.action == "generate_ai_insights":
                 dataset_id = self.kwargs.get("dataset_id")
                 insights = api_client.get_ai_insights(dataset_id)
-                self.ai_insights_ready.emit(insights)
+                self.signals.ai_insights_ready.emit(insights)
+            elif self.action == "download_pdf":
+                dataset_id = self.kwargs.get("dataset_id")
+                save_path = self.kwargs.get("save_path")
+                success = api_client.download_pdf(dataset_id, save_path)
+                self.signals.download_complete.emit(success, save_path)
 
         except Exception as e:
-            self.error.emit(str(e))
+            self.signals.error.emit(str(e))
+
+
+class PreviewModel(QAbstractTableModel):
+    """Read-only table model over dataset preview rows; cells are rendered on demand"""
+    
+    def __init__(self, rows, parent=None):
+        super().__init__(parent)
+        self._rows = rows
+        self._cols = list(rows[0].keys()) if rows else []
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._cols)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        return str(self._rows[index.row()].get(self._cols[index.column()], ''))
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self._cols[section]
+        return str(section + 1)
 
 
-class ChartCanvas(FigureCanvas):
-    """Matplotlib canvas for displaying charts"""
+class ChartCanvas(QLabel):
+    """Static chart: a matplotlib figure rendered with Agg and shown as a pixmap"""
     
     def __init__(self, parent=None, width=6, height=4, dpi=100):
+        super().__init__(parent)
         self.fig = Figure(figsize=(width, height), dpi=dpi)
-        super().__init__(self.fig)
-        self.setParent(parent)
+        self._agg = FigureCanvasAgg(self.fig)
+        self._image_data = None
+        self.setAlignment(Qt.AlignCenter)
+        self.setMinimumSize(1, 1)
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        self.updateGeometry()
+        # One Axes is created up front and reused by every plot; fixed margins replace
+        # tight_layout, which costs an extra measuring draw per render
+        self._ax = self.fig.add_subplot(111)
+        self._ax.set_axis_off()
+        self.fig.subplots_adjust(left=0.1, right=0.95, top=0.9, bottom=CHART_BOTTOM_MARGIN)
+        # Plots and resizes within one event-loop turn collapse into a single render
+        self._render_timer = QTimer(self)
+        self._render_timer.setSingleShot(True)
+        self._render_timer.setInterval(0)
+        self._render_timer.timeout.connect(self._render)
+    
+    def draw_idle(self):
+        """Schedule a render on the next event-loop turn"""
+        self._render_timer.start()
+    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.draw_idle()
+    
+    def _render(self):
+        """Rasterise the figure at the label's size and display it"""
+        ratio = self.devicePixelRatioF()
+        dpi = self.fig.dpi
+        self.fig.set_size_inches(self.width() * ratio / dpi, self.height() * ratio / dpi)
+        self._agg.draw()
+        
+        rgba = self._agg.buffer_rgba()
+        height, width = rgba.shape[:2]
+        # QImage does not copy its input, so the bytes are kept alive on the instance
+        self._image_data = bytes(rgba)
+        image = QImage(self._image_data, width, height, width * 4, QImage.Format_RGBA8888)
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(ratio)
+        self.setPixmap(pixmap)
     
     def clear_chart(self):
         """Clear the chart"""
-        self.fig.clear()
-        self.draw()
+        self._ax.cla()
+        self._ax.set_axis_off()
+        self.draw_idle()
     
     def plot_type_distribution(self, data):
         """Plot equipment type distribution as bar chart"""
@@ -79,8 +317,9 @@ class ChartCanvas(FigureCanvas):
             self.clear_chart()
             return
         
-        self.fig.clear()
-        ax = self.fig.add_subplot(111)
+        ax = self._ax
+        ax.cla()
+        ax.set_axis_on()
         
         types = list(data['type_distribution'].keys())
         counts = list(data['type_distribution'].values())
@@ -94,9 +333,13 @@ class ChartCanvas(FigureCanvas):
         ax.set_title('Equipment Type Distribution')
         ax.grid(True, alpha=0.3)
         
-        # Rotate x-axis labels if needed
-        if len(types) > 5:
-            plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+        # Rotate x-axis labels if needed, leaving room below the axis for them
+        rotate = len(types) > 5
+        self.fig.subplots_adjust(bottom=CHART_ROTATED_BOTTOM_MARGIN if rotate else CHART_BOTTOM_MARGIN)
+        if rotate:
+            for label in ax.get_xticklabels():
+                label.set_rotation(45)
+                label.set_horizontalalignment('right')
         
         # Add value labels on top of bars
         for bar in bars:
@@ -105,12 +348,8 @@ class ChartCanvas(FigureCanvas):
                    f'{int(height)}',
                    ha='center', va='bottom')
         
-        try:
-            self.fig.tight_layout()
-        except Exception as e:
-            print(f"DEBUG: tight_layout failed: {e}")
-        
-        self.draw()
+        # Rasterisation happens in _render, at the label's current size
+        self.draw_idle()
 
 
 class MainWindow(QMainWindow):
@@ -120,9 +359,17 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.current_dataset = None
         self.datasets = []
-        self.worker = None
+        self._pending_dataset_id = None
+        self._detail_worker = None
+        # Requests currently running, keyed by (action, dataset_id), so repeat clicks don't duplicate them
+        self._inflight = {}
+        self._select_timer = QTimer(self)
+        self._select_timer.setSingleShot(True)
+        self._select_timer.setInterval(SELECTION_DEBOUNCE_MS)
+        self._select_timer.timeout.connect(lambda: self.load_dataset_detail(self._pending_dataset_id))
         self.init_ui()
-        self.load_initial_data()
+        # Fetch data once the event loop is running so the window paints first
+        QTimer.singleShot(0, self.load_initial_data)
     
     def init_ui(self):
         """Initialize the user interface"""
@@ -170,7 +417,7 @@ class MainWindow(QMainWindow):
         
         # User info
         self.user_label = QLabel("User: Not logged in")
-        self.user_label.setFont(QFont("Arial", 10, QFont.Bold))
+        self.user_label.setFont(_font(10, QFont.Bold))
         left_layout.addWidget(self.user_label)
         
         # Upload section
@@ -179,7 +426,7 @@ class MainWindow(QMainWindow):
         upload_layout = QVBoxLayout(upload_frame)
         
         upload_title = QLabel("Upload Data")
-        upload_title.setFont(QFont("Arial", 12, QFont.Bold))
+        upload_title.setFont(_font(12, QFont.Bold))
         upload_layout.addWidget(upload_title)
         
         self.upload_button = QPushButton("📁 Upload CSV")
@@ -198,7 +445,7 @@ class MainWindow(QMainWindow):
         history_layout = QVBoxLayout(history_frame)
         
         history_title = QLabel("Dataset History")
-        history_title.setFont(QFont("Arial", 12, QFont.Bold))
+        history_title.setFont(_font(12, QFont.Bold))
         history_layout.addWidget(history_title)
         
         self.history_list = QListWidget()
@@ -219,19 +466,12 @@ class MainWindow(QMainWindow):
         
         self.ai_button = QPushButton("✨ AI Insights")
         self.ai_button.clicked.connect(self.handle_ai_insights)
+        self.ai_button.setObjectName("aiButton")
         self.ai_button.setEnabled(False)
-        self.ai_button.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #ed8936, stop:1 #f6ad55);
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #dd6b20, stop:1 #ed8936);
-            }
-        """)
         actions_layout.addWidget(self.ai_button)
         
         self.refresh_button = QPushButton("🔄 Refresh")
-        self.refresh_button.clicked.connect(self.load_initial_data)
+        self.refresh_button.clicked.connect(lambda: self.load_initial_data())
         actions_layout.addWidget(self.refresh_button)
         
         left_layout.addWidget(actions_frame)
@@ -248,13 +488,15 @@ class MainWindow(QMainWindow):
         
         # Title
         self.title_label = QLabel("Dashboard")
-        self.title_label.setFont(QFont("Arial", 16, QFont.Bold))
+        self.title_label.setFont(_font(16, QFont.Bold))
         right_layout.addWidget(self.title_label)
         
         # Summary cards
         self.summary_frame = QFrame()
         self.summary_frame.setObjectName("summaryFrame")
         self.summary_layout = QGridLayout(self.summary_frame)
+        # Value labels of the summary cards, built on the first dataset and reused after
+        self._summary_value_labels = {}
         right_layout.addWidget(self.summary_frame)
         
         # Chart section
@@ -263,7 +505,7 @@ class MainWindow(QMainWindow):
         chart_layout = QVBoxLayout(chart_frame)
         
         chart_title = QLabel("Equipment Type Distribution")
-        chart_title.setFont(QFont("Arial", 12, QFont.Bold))
+        chart_title.setFont(_font(12, QFont.Bold))
         chart_layout.addWidget(chart_title)
         
         self.chart_canvas = ChartCanvas(self, width=8, height=4)
@@ -277,7 +519,7 @@ class MainWindow(QMainWindow):
         table_layout = QVBoxLayout(table_frame)
         
         table_title = QLabel("Equipment Data")
-        table_title.setFont(QFont("Arial", 12, QFont.Bold))
+        table_title.setFont(_font(12, QFont.Bold))
         table_layout.addWidget(table_title)
         
         # Create table with scroll area
@@ -286,7 +528,7 @@ class MainWindow(QMainWindow):
         scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         
-        self.data_table = QTableWidget()
+        self.data_table = QTableView()
         self.data_table.setAlternatingRowColors(True)
         self.data_table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
         self.data_table.horizontalHeader().setStretchLastSection(True)
@@ -326,118 +568,34 @@ class MainWindow(QMainWindow):
     
     def apply_styles(self):
         """Apply modern styling to the window"""
-        self.setStyleSheet("""
-            QMainWindow {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                    stop:0 #f5f7fa, stop:1 #c3cfe2);
-            }
-            
-            QFrame#uploadFrame, QFrame#historyFrame, QFrame#actionsFrame,
-            QFrame#summaryFrame, QFrame#chartFrame, QFrame#tableFrame {
-                background: rgba(255, 255, 255, 0.9);
-                border: 1px solid rgba(255, 255, 255, 0.3);
-                border-radius: 10px;
-                padding: 15px;
-                margin: 5px;
-            }
-            
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #667eea, stop:1 #764ba2);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px;
-                font-size: 12px;
-                font-weight: bold;
-            }
-            
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #5a67d8, stop:1 #6b46c1);
-            }
-            
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #4c51bf, stop:1 #553c9a);
-            }
-            
-            QPushButton:disabled {
-                background: #cbd5e0;
-                color: #718096;
-            }
-            
-            QListWidget {
-                background: white;
-                border: 1px solid #e2e8f0;
-                border-radius: 8px;
-                padding: 5px;
-            }
-            
-            QListWidget::item {
-                padding: 8px;
-                border-bottom: 1px solid #f7fafc;
-            }
-            
-            QListWidget::item:selected {
-                background: #667eea;
-                color: white;
-            }
-            
-            QListWidget::item:hover {
-                background: #edf2f7;
-            }
-            
-            QTableWidget {
-                background: white;
-                border: 1px solid #e2e8f0;
-                border-radius: 8px;
-                gridline-color: #f7fafc;
-            }
-            
-            QTableWidget::item {
-                padding: 5px;
-                border-bottom: 1px solid #f7fafc;
-            }
-            
-            QTableWidget::item:selected {
-                background: #667eea;
-                color: white;
-            }
-            
-            QHeaderView::section {
-                background: #f7fafc;
-                border: none;
-                border-bottom: 2px solid #e2e8f0;
-                padding: 8px;
-                font-weight: bold;
-            }
-            
-            QProgressBar {
-                border: 1px solid #e2e8f0;
-                border-radius: 4px;
-                text-align: center;
-                background: white;
-            }
-            
-            QProgressBar::chunk {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #667eea, stop:1 #764ba2);
-                border-radius: 3px;
-            }
-        """)
-    
-    def load_initial_data(self):
+        self.setStyleSheet(MAIN_STYLESHEET)
+    
+    def _start_worker(self, key, worker):
+        """Start a pooled worker and track it as in flight under key until it finishes"""
+        self._inflight[key] = worker
+        worker.signals.finished.connect(lambda: self._on_worker_finished(key, worker))
+        QThreadPool.globalInstance().start(worker)
+    
+    def _on_worker_finished(self, key, worker):
+        """Forget a finished worker unless a newer one has taken its key"""
+        if self._inflight.get(key) is worker:
+            del self._inflight[key]
+    
+    def load_initial_data(self, force=False):
         """Load initial data from API"""
         if not api_client.is_authenticated():
             self.show_error("Not authenticated. Please login first.")
             return
         
+        key = ("load_datasets", None)
+        if key in self._inflight and not force:
+            return
+        
         self.status_bar.showMessage("Loading datasets...")
-        self.worker = DataWorker("load_datasets")
-        self.worker.datasets_loaded.connect(self.on_datasets_loaded)
-        self.worker.error.connect(self.on_error)
-        self.worker.start()
+        worker = DataWorker("load_datasets")
+        worker.signals.datasets_loaded.connect(self.on_datasets_loaded)
+        worker.signals.error.connect(self.on_error)
+        self._start_worker(key, worker)
     
     @pyqtSlot(list)
     def on_datasets_loaded(self, datasets):
@@ -453,8 +611,18 @@ class MainWindow(QMainWindow):
     @pyqtSlot(dict)
     def on_dataset_detail_loaded(self, detail):
         """Handle dataset detail loaded from API"""
+        # Drop responses for selections the user has already moved away from
+        if detail.get('id') != self._pending_dataset_id:
+            return
+        # Datasets are immutable once uploaded, so the same id and upload time means
+        # the widgets already show this data
+        current = self.current_dataset
+        unchanged = (current is not None
+                     and current.get('id') == detail.get('id')
+                     and current.get('uploaded_at') == detail.get('uploaded_at'))
         self.current_dataset = detail
-        self.update_ui_with_dataset(detail)
+        if not unchanged:
+            self.update_ui_with_dataset(detail)
         self.status_bar.showMessage(f"Loaded dataset: {detail.get('name', 'Unknown')}")
     
     @pyqtSlot(str)
@@ -488,11 +656,22 @@ class MainWindow(QMainWindow):
     
     def load_dataset_detail(self, dataset_id):
         """Load detail for a specific dataset"""
+        self._pending_dataset_id = dataset_id
+        key = ("load_dataset_detail", dataset_id)
+        if key in self._inflight:
+            return
+        
         self.status_bar.showMessage("Loading dataset details...")
-        self.worker = DataWorker("load_dataset_detail", dataset_id=dataset_id)
-        self.worker.dataset_detail_loaded.connect(self.on_dataset_detail_loaded)
-        self.worker.error.connect(self.on_error)
-        self.worker.start()
+        # A newer selection supersedes any detail fetch still queued or in flight
+        previous = self._detail_worker
+        if previous is not None:
+            previous.cancel()
+            self._on_worker_finished(("load_dataset_detail", previous.kwargs.get("dataset_id")), previous)
+        worker = DataWorker("load_dataset_detail", dataset_id=dataset_id)
+        worker.signals.dataset_detail_loaded.connect(self.on_dataset_detail_loaded)
+        worker.signals.error.connect(self.on_error)
+        self._detail_worker = worker
+        self._start_worker(key, worker)
     
     def update_ui_with_dataset(self, dataset):
         """Update UI with dataset data"""
@@ -514,11 +693,6 @@ class MainWindow(QMainWindow):
     
     def update_summary_cards(self, dataset):
         """Update summary cards with dataset information"""
-        # Clear existing widgets
-        for i in reversed(range(self.summary_layout.count())): 
-            self.summary_layout.itemAt(i).widget().setParent(None)
-        
-        # Create summary cards
         cards_data = [
             ("Total Records", dataset.get('total_count', 0), "📊"),
             ("Avg Flowrate", f"{dataset.get('avg_flowrate', 0):.2f}", "💧"),
@@ -526,12 +700,18 @@ class MainWindow(QMainWindow):
             ("Avg Temperature", f"{dataset.get('avg_temperature', 0):.2f}", "🌡️"),
         ]
         
-        for i, (title, value, icon) in enumerate(cards_data):
-            card = self.create_summary_card(title, value, icon)
-            self.summary_layout.addWidget(card, i // 2, i % 2)
+        # Create the cards once; later datasets only change the value text
+        if not self._summary_value_labels:
+            for i, (title, _, icon) in enumerate(cards_data):
+                card, value_label = self.create_summary_card(title, icon)
+                self._summary_value_labels[title] = value_label
+                self.summary_layout.addWidget(card, i // 2, i % 2)
+        
+        for title, value, _ in cards_data:
+            self._summary_value_labels[title].setText(str(value))
     
-    def create_summary_card(self, title, value, icon):
-        """Create a summary card widget"""
+    def create_summary_card(self, title, icon):
+        """Create a summary card widget and return it with its value label"""
         card = QFrame()
         card.setObjectName("summaryCard")
         card_layout = QVBoxLayout(card)
@@ -539,59 +719,35 @@ class MainWindow(QMainWindow):
         # Icon
         icon_label = QLabel(icon)
         icon_label.setAlignment(Qt.AlignCenter)
-        icon_label.setFont(QFont("Arial", 24))
+        icon_label.setFont(_font(24))
         card_layout.addWidget(icon_label)
         
         # Title
         title_label = QLabel(title)
         title_label.setAlignment(Qt.AlignCenter)
-        title_label.setFont(QFont("Arial", 10))
+        title_label.setFont(_font(10))
         card_layout.addWidget(title_label)
         
         # Value
-        value_label = QLabel(str(value))
+        value_label = QLabel()
         value_label.setAlignment(Qt.AlignCenter)
-        value_label.setFont(QFont("Arial", 16, QFont.Bold))
+        value_label.setFont(_font(16, QFont.Bold))
         card_layout.addWidget(value_label)
         
-        # Style the card
-        card.setStyleSheet("""
-            QFrame#summaryCard {
-                background: rgba(255, 255, 255, 0.8);
-                border: 1px solid rgba(102, 126, 234, 0.3);
-                border-radius: 8px;
-                padding: 10px;
-                margin: 5px;
-            }
-        """)
-        
-        return card
+        return card, value_label
     
     def update_data_table(self, dataset):
         """Update data table with dataset preview rows"""
         preview_rows = dataset.get('preview_rows', [])
         
-        if not preview_rows:
-            self.data_table.setRowCount(0)
-            self.data_table.setColumnCount(0)
-            return
-        
-        # Get column names from first row
-        columns = list(preview_rows[0].keys())
-        self.data_table.setColumnCount(len(columns))
-        self.data_table.setHorizontalHeaderLabels(columns)
-        
-        # Set row count and populate data
-        self.data_table.setRowCount(len(preview_rows))
-        
-        for row_idx, row_data in enumerate(preview_rows):
-            for col_idx, column in enumerate(columns):
-                value = str(row_data.get(column, ''))
-                item = QTableWidgetItem(value)
-                self.data_table.setItem(row_idx, col_idx, item)
+        # The model renders cells on demand, so no per-cell item objects are created
+        previous_model = self.data_table.model()
+        self.data_table.setModel(PreviewModel(preview_rows, self.data_table))
+        if previous_model is not None:
+            previous_model.deleteLater()
         
-        # Resize columns to content
-        self.data_table.resizeColumnsToContents()
+        if preview_rows:
+            self.data_table.resizeColumnsToContents()
     
     @pyqtSlot()
     def handle_upload_csv(self):
@@ -618,11 +774,11 @@ class MainWindow(QMainWindow):
         self.upload_button.setEnabled(False)
         
         self.status_bar.showMessage("Uploading CSV file...")
-        self.worker = DataWorker("upload_csv", file_path=file_path)
-        self.worker.upload_progress.connect(self.on_upload_progress)
-        self.worker.upload_complete.connect(self.on_upload_complete)
-        self.worker.error.connect(self.on_error)
-        self.worker.start()
+        worker = DataWorker("upload_csv", file_path=file_path)
+        worker.signals.upload_progress.connect(self.on_upload_progress)
+        worker.signals.upload_complete.connect(self.on_upload_complete)
+        worker.signals.error.connect(self.on_error)
+        self._start_worker(("upload_csv", file_path), worker)
     
     @pyqtSlot(int)
     def on_upload_progress(self, progress):
@@ -641,15 +797,17 @@ class MainWindow(QMainWindow):
             "CSV file uploaded successfully!"
         )
         
-        # Refresh datasets
-        self.load_initial_data()
+        # Refresh datasets; a list fetch already in flight may predate the upload
+        self.load_initial_data(force=True)
     
     @pyqtSlot(QListWidgetItem)
     def handle_history_selection(self, item):
         """Handle history list item selection"""
         dataset_id = item.data(Qt.UserRole)
         if dataset_id:
-            self.load_dataset_detail(dataset_id)
+            # Restart the debounce so only the last of several quick selections is fetched
+            self._pending_dataset_id = dataset_id
+            self._select_timer.start()
     
     @pyqtSlot()
     def handle_download_pdf(self):
@@ -682,36 +840,53 @@ class MainWindow(QMainWindow):
             self.show_error("No dataset selected")
             return
         
-        try:
-            self.status_bar.showMessage("Downloading PDF report...")
-            success = api_client.download_pdf(self.current_dataset['id'], save_path)
-            
-            if success:
-                QMessageBox.information(
-                    self,
-                    "Download Successful",
-                    f"PDF report saved to:\n{save_path}"
-                )
-                self.status_bar.showMessage("PDF downloaded successfully")
-            else:
-                self.show_error("Failed to download PDF")
-        except Exception as e:
-            self.show_error(f"PDF download failed: {str(e)}")
+        key = ("download_pdf", self.current_dataset['id'])
+        if key in self._inflight:
+            return
+        
+        self.status_bar.showMessage("Downloading PDF report...")
+        worker = DataWorker("download_pdf", dataset_id=self.current_dataset['id'], save_path=save_path)
+        worker.signals.download_complete.connect(self.on_download_complete)
+        worker.signals.error.connect(self.on_download_error)
+        self._start_worker(key, worker)
+    
+    @pyqtSlot(bool, str)
+    def on_download_complete(self, success, save_path):
+        """Handle PDF download completion"""
+        if success:
+            QMessageBox.information(
+                self,
+                "Download Successful",
+                f"PDF report saved to:\n{save_path}"
+            )
+            self.status_bar.showMessage("PDF downloaded successfully")
+        else:
+            self.show_error("Failed to download PDF")
+    
+    @pyqtSlot(str)
+    def on_download_error(self, error_message):
+        """Handle PDF download error"""
+        self.show_error(f"PDF download failed: {error_message}")
+        self.status_bar.showMessage("Error downloading PDF")
     
     def handle_ai_insights(self):
         """Handle AI insights generation"""
         if not self.current_dataset:
             self.show_error("No dataset selected")
             return
+        
+        key = ("generate_ai_insights", self.current_dataset['id'])
+        if key in self._inflight:
+            return
             
         self.status_bar.showMessage("Generating AI insights... This may take a moment.")
         self.ai_button.setEnabled(False)
         self.ai_button.setText("Generating...")
         
-        self.worker = DataWorker("generate_ai_insights", dataset_id=self.current_dataset['id'])
-        self.worker.ai_insights_ready.connect(self.on_ai_insights_ready)
-        self.worker.error.connect(self.on_ai_error)
-        self.worker.start()
+        worker = DataWorker("generate_ai_insights", dataset_id=self.current_dataset['id'])
+        worker.signals.ai_insights_ready.connect(self.on_ai_insights_ready)
+        worker.signals.error.connect(self.on_ai_error)
+        self._start_worker(key, worker)
         
     @pyqtSlot(str)
     def on_ai_insights_ready(self, insights):
@@ -730,13 +905,13 @@ class MainWindow(QMainWindow):
         layout = QVBoxLayout(dialog)
         
         title = QLabel(f"Insights for {self.current_dataset.get('name', 'Dataset')}")
-        title.setFont(QFont("Arial", 14, QFont.Bold))
+        title.setFont(_font(14, QFont.Bold))
         layout.addWidget(title)
         
         text_area = QTextEdit()
         text_area.setReadOnly(True)
         text_area.setMarkdown(insights) # Use setMarkdown for formatting
-        text_area.setFont(QFont("Arial", 11))
+        text_area.setFont(_font(11))
         layout.addWidget(text_area)
         
         close_btn = QPushButton("Close")
@@ -770,10 +945,21 @@ class MainWindow(QMainWindow):
     
     def closeEvent(self, event):
         """Handle window close event"""
-        # Cancel any running worker
-        if self.worker and self.worker.isRunning():
-            self.worker.terminate()
-            self.worker.wait()
+        # Drop queued API calls, then cancel and disconnect the running ones so their
+        # results never reach this window once it is gone
+        pool = QThreadPool.globalInstance()
+        pool.clear()
+        workers = set(self._inflight.values())
+        if self._detail_worker is not None:
+            workers.add(self._detail_worker)
+        for worker in workers:
+            worker.detach()
+        self._inflight.clear()
+        self._detail_worker = None
+        
+        # An HTTP call already on the wire cannot be interrupted; give it a bounded
+        # chance to finish instead of blocking the close indefinitely
+        pool.waitForDone(WORKER_SHUTDOWN_TIMEOUT_MS)
         
         event.accept()
 